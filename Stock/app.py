@@ -11,26 +11,25 @@ import numpy as np
 from datetime import datetime
 import warnings
 
-warnings.filterwarnings("ignore")
+# Silence known third-party noise only; our own modules keep default filters
+warnings.filterwarnings("ignore", category=FutureWarning,      module="yfinance")
+warnings.filterwarnings("ignore", category=UserWarning,        module="pandas")
+warnings.filterwarnings("ignore", category=DeprecationWarning, module="sklearn")
 
 # ── Local modules ──────────────────────────────
 from utils.config import CUSTOM_CSS
-from utils.data import fetch_ohlcv, fetch_info, fetch_news, fetch_multiple_close
+from utils.data import fetch_ohlcv, fetch_info_many, fetch_news, fetch_multiple_close
 from utils.analysis import (
     compute_signals,
     compute_performance_table,
     compute_correlation,
     compute_returns,
 )
-from utils.model import train_and_predict
-
 from components.charts import (
     build_overview_chart,
     build_comparison_chart,
     build_return_bar,
     build_correlation_heatmap,
-    build_prediction_chart,
-    build_feature_importance_chart,
     build_rsi_gauge,
 )
 from components.ui import (
@@ -70,7 +69,6 @@ primary_ticker = cfg["primary_ticker"]
 selected_tickers = cfg["selected_tickers"]
 period = cfg["period"]
 period_label = cfg["period_label"]
-show_bb = cfg["show_bb"]
 model_type = "Random Forest"
 pred_days = 30
 
@@ -86,13 +84,19 @@ render_header(datetime.now().strftime("%B %d, %Y | %H:%M"))
 # ─────────────────────────────────────────────
 with st.spinner(f"Loading data for {primary_ticker}..."):
     primary_df = fetch_ohlcv(primary_ticker, period)
-    info = fetch_info(primary_ticker)
+    # Metadata for every selected ticker in one concurrent pass, so picking
+    # a different primary stock is a cache hit rather than a new request
+    info = fetch_info_many(tuple(selected_tickers)).get(primary_ticker, {})
     news = fetch_news(primary_ticker)
 
 if primary_df.empty:
     st.error("Unable to fetch data. Please check your connection or try a different ticker.")
     st.stop()
 
+# Extract the close array once; reused by the charts and forecast metrics
+close_np = np.ascontiguousarray(primary_df["Close"].to_numpy(dtype=np.float64)).ravel()
+current_price = float(close_np[-1])
+
 signals = compute_signals(primary_df)
 
 if not signals:
@@ -111,17 +115,29 @@ st.divider()
 # ─────────────────────────────────────────────
 # MAIN CONTENT TABS
 # ─────────────────────────────────────────────
-tab1, tab2, tab3 = st.tabs([
-    "Overview",
-    "Comparison",
-    "AI Predictions",
-])
+# A radio rather than st.tabs: tabs execute every body on each rerun, while
+# this renders (and fetches / trains for) only the selected view.
+active_tab = st.radio(
+    "View",
+    ["Overview", "Comparison", "AI Predictions"],
+    horizontal=True,
+    key="active_tab",
+    label_visibility="collapsed",
+)
 
 
 # ═════════════════════════════════════════════
 # TAB 1: OVERVIEW
 # ═════════════════════════════════════════════
-with tab1:
+@st.fragment
+def render_overview_chart(df: pd.DataFrame, signals: dict, close: np.ndarray) -> None:
+    """Price chart with its Bollinger toggle; flipping it reruns only this block."""
+    show_bb = st.toggle("Show Bollinger Bands", value=True, key="show_bb")
+    fig_overview = build_overview_chart(df, signals, show_bb=show_bb, close=close)
+    st.plotly_chart(fig_overview, use_container_width=True)
+
+
+if active_tab == "Overview":
     col_chart, col_panel = st.columns([2, 1], gap="medium")
 
     with col_chart:
@@ -132,8 +148,7 @@ with tab1:
         </h3>
         """, unsafe_allow_html=True)
         
-        fig_overview = build_overview_chart(primary_df, signals, show_bb=show_bb)
-        st.plotly_chart(fig_overview, use_container_width=True)
+        render_overview_chart(primary_df, signals, close_np)
 
         # RSI Gauge and MACD Summary
         gauge_col, macd_col = st.columns([1, 3])
@@ -143,10 +158,9 @@ with tab1:
             st.plotly_chart(build_rsi_gauge(rsi_val), use_container_width=True)
         
         with macd_col:
-            macd_data = signals.get("macd", {})
-            macd_val = float(macd_data["macd"].iloc[-1]) if macd_data.get("macd") is not None else 0
-            signal_val = float(macd_data["signal"].iloc[-1]) if macd_data.get("signal") is not None else 0
-            hist_val = float(macd_data["histogram"].iloc[-1]) if macd_data.get("histogram") is not None else 0
+            macd_val = signals.get("macd_val", 0)
+            signal_val = signals.get("macd_signal_val", 0)
+            hist_val = signals.get("macd_hist_val", 0)
             
             with st.container(border=True):
                 st.markdown(f"""
@@ -182,7 +196,7 @@ with tab1:
 # ═════════════════════════════════════════════
 # TAB 2: COMPARISON
 # ═════════════════════════════════════════════
-with tab2:
+if active_tab == "Comparison":
     st.markdown(f"""
     <h3 style="display:flex;align-items:center;gap:8px;margin-bottom:4px">
         {icon('compare_arrows', '24px', '#e2e8f0')}
@@ -195,7 +209,7 @@ with tab2:
     with st.spinner("Loading comparison data..."):
         all_data = fetch_multiple_close(selected_tickers, period)
 
-    if not all_data:
+    if all_data.empty:
         st.warning("No data available for the selected securities.")
     else:
         # Relative Performance Chart
@@ -228,7 +242,7 @@ with tab2:
         )
 
         # Correlation Matrix
-        if len(all_data) >= 2:
+        if all_data.shape[1] >= 2:
             st.markdown(f"""
             <h4 style="display:flex;align-items:center;gap:8px;margin:24px 0 8px">
                 {icon('hub', '20px', '#94a3b8')}
@@ -245,7 +259,7 @@ with tab2:
             )
 
         # Export Button
-        csv_data = compute_performance_table(all_data, period_label).to_csv()
+        csv_data = perf_df.to_csv().encode("utf-8")
         
         st.download_button(
             label="Export Performance Data",
@@ -253,13 +267,18 @@ with tab2:
             file_name=f"marketlens_performance_{period}.csv",
             mime="text/csv",
             type="secondary",
+            on_click="ignore",   # serve the file without rerunning the app
         )
 
 
 # ═════════════════════════════════════════════
 # TAB 3: AI PREDICTIONS
 # ═════════════════════════════════════════════
-with tab3:
+if active_tab == "AI Predictions":
+    # Deferred: sklearn is only needed once the forecast tab renders
+    from utils.model import train_and_predict_cached
+    from components.charts import build_prediction_chart, build_feature_importance_chart
+
     st.markdown(f"""
     <h3 style="display:flex;align-items:center;gap:8px;margin-bottom:4px">
         {icon('psychology', '24px', '#e2e8f0')}
@@ -275,9 +294,11 @@ with tab3:
     )
 
     with st.spinner(f"Training {model_type} model..."):
-        result = train_and_predict(primary_df, model_name=model_type, pred_days=pred_days)
+        result = train_and_predict_cached(
+            primary_ticker, period, int(primary_df.index[-1].value),
+            model_name=model_type, pred_days=pred_days,
+        )
 
-    current_price = float(primary_df["Close"].squeeze().iloc[-1])
     final_prediction = float(result.future_prices[-1])
     predicted_change = (final_prediction - current_price) / current_price * 100
 
@@ -322,6 +343,7 @@ with tab3:
             result.future_dates,
             result.future_prices,
             model_type,
+            hist_close=close_np[-display_days:],
         ),
         use_container_width=True,
     )
@@ -366,21 +388,20 @@ with tab3:
         )
 
         # Export Forecast
+        future_prices = np.asarray(result.future_prices, dtype=np.float64)
         forecast_df = pd.DataFrame({
             "Date": result.future_dates.strftime("%Y-%m-%d"),
-            "Predicted_Close": [f"{p:.4f}" for p in result.future_prices],
-            "Change_Pct": [
-                f"{(p - current_price) / current_price * 100:.2f}"
-                for p in result.future_prices
-            ],
+            "Predicted_Close": future_prices,
+            "Change_Pct": (future_prices - current_price) / current_price * 100.0,
         })
         
         st.download_button(
             label="Export Forecast Data",
-            data=forecast_df.to_csv(index=False),
+            data=forecast_df.to_csv(index=False, float_format="%.2f"),
             file_name=f"{primary_ticker}_forecast_{pred_days}d.csv",
             mime="text/csv",
             type="secondary",
+            on_click="ignore",   # serve the file without rerunning the app
         )
 
     # Risk Disclaimer
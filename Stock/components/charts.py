@@ -2,20 +2,90 @@
 charts.py — All Plotly chart builders.
 
 Each function returns a go.Figure ready for st.plotly_chart().
+The heavier builders are memoized with st.cache_resource, keyed on a hash of
+their pandas inputs' full contents, so unchanged reruns reuse the
+already-built figure. Cached figures are shared: do not mutate them.
 """
 
+import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 
 from utils.config import PLOTLY_THEME, COLORS
+from utils.downsample import (
+    DOWNSAMPLE_THRESHOLD,
+    lttb_indices,
+    ohlc_bucket_reduce,
+)
 
 
 # ─────────────────────────────────────────────
 # HELPERS
 # ─────────────────────────────────────────────
+def _content_hash(obj) -> int:
+    """Digest of every value and index label (row hashes summed mod 2**64)."""
+    return int(pd.util.hash_pandas_object(obj).sum())
+
+
+def _frame_key(df: pd.DataFrame) -> tuple:
+    """Cache fingerprint: shape, columns and a hash of the full contents."""
+    return (df.shape, tuple(df.columns), _content_hash(df))
+
+
+def _series_key(s: pd.Series) -> tuple:
+    return (len(s), s.name, _content_hash(s))
+
+
+def _index_key(idx: pd.DatetimeIndex) -> tuple:
+    return (len(idx), _content_hash(idx))
+
+
+_HASH_FUNCS = {
+    pd.DataFrame:     _frame_key,
+    pd.Series:        _series_key,
+    pd.DatetimeIndex: _index_key,
+}
+
+
+def _cached_figure(func):
+    """Memoize a figure builder across reruns (figures are not pickled)."""
+    return st.cache_resource(
+        show_spinner=False, max_entries=32, hash_funcs=_HASH_FUNCS,
+    )(func)
+
+
+def _x_values(index: pd.Index) -> np.ndarray:
+    """Numeric x for LTTB: epoch-ns for dates (tz-safe), position otherwise."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8
+    return np.arange(len(index))
+
+
+def _thin(s: pd.Series, idx: np.ndarray | None = None) -> tuple:
+    """
+    (x, y) for a line trace, LTTB-reduced when the series is long.
+    Pass `idx` to reuse another trace's selection (e.g. paired BB bands).
+    """
+    if idx is None:
+        if len(s) <= DOWNSAMPLE_THRESHOLD:
+            return s.index, s
+        idx = lttb_indices(_x_values(s.index), s.to_numpy())
+    return s.index[idx], s.iloc[idx]
+
+
+def _f32(values) -> np.ndarray:
+    """float32 copy of a Series/array for trace payloads (half the bytes of float64)."""
+    arr = values.to_numpy() if hasattr(values, "to_numpy") else np.asarray(values)
+    return arr.astype(np.float32, copy=False)
+
+
+def _plottable(s: pd.Series | None) -> bool:
+    """True if `s` has at least two finite points (i.e. is past its warm-up)."""
+    return s is not None and int(np.isfinite(s.to_numpy(dtype=np.float64)).sum()) >= 2
+
+
 def _apply_theme(fig: go.Figure, height: int = 480) -> go.Figure:
     fig.update_layout(**PLOTLY_THEME, height=height)
     return fig
@@ -24,12 +94,16 @@ def _apply_theme(fig: go.Figure, height: int = 480) -> go.Figure:
 # ─────────────────────────────────────────────
 # OVERVIEW: CANDLESTICK + VOLUME + RSI + MACD
 # ─────────────────────────────────────────────
+@_cached_figure
 def build_overview_chart(
     df:      pd.DataFrame,
     signals: dict,
     show_bb: bool = True,
+    close:   np.ndarray | None = None,
 ) -> go.Figure:
-    close  = df["Close"].squeeze()
+    """`close` may be passed pre-extracted to skip re-materializing df["Close"]."""
+    if close is None:
+        close = df["Close"].to_numpy(dtype=np.float64).ravel()
     ma20   = signals.get("ma20")
     ma50   = signals.get("ma50")
     ma200  = signals.get("ma200")
@@ -37,79 +111,111 @@ def build_overview_chart(
     macd_d = signals.get("macd", {})
     bb     = signals.get("bb", {})
 
-    fig = make_subplots(
-        rows=3, cols=1,
-        shared_xaxes=True,
-        row_heights=[0.60, 0.20, 0.20],
-        vertical_spacing=0.03,
-        subplot_titles=("", "RSI (14)", "MACD"),
-    )
-
-    # ── Candlestick ──
-    fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df["Open"].squeeze(),
-        high=df["High"].squeeze(),
-        low=df["Low"].squeeze(),
-        close=close,
+    # (trace, subplot row) pairs, added to the figure in one add_traces call
+    layers: list[tuple[go.Scatter | go.Bar | go.Candlestick, int]] = []
+
+    # ── Candlestick (bucketed OHLC on long histories) ──
+    if len(df) > DOWNSAMPLE_THRESHOLD:
+        first, o, h, l, c = ohlc_bucket_reduce(
+            df["Open"].to_numpy(), df["High"].to_numpy(),
+            df["Low"].to_numpy(), close,
+        )
+        candle_x = df.index[first]
+    else:
+        o, h, l, c = df["Open"], df["High"], df["Low"], close
+        candle_x = df.index
+    layers.append((go.Candlestick(
+        x=candle_x,
+        open=_f32(o),
+        high=_f32(h),
+        low=_f32(l),
+        close=_f32(c),
         name="OHLC",
         increasing_line_color="#00d4aa",
         decreasing_line_color="#f43f5e",
         increasing_fillcolor="rgba(0,212,170,0.25)",
         decreasing_fillcolor="rgba(244,63,94,0.25)",
-    ), row=1, col=1)
+    ), 1))
 
     # ── Bollinger Bands ──
-    if show_bb and bb:
-        fig.add_trace(go.Scatter(
-            x=df.index, y=bb["upper"],
+    if show_bb and bb and _plottable(bb.get("upper")) and _plottable(bb.get("lower")):
+        bb_idx = (
+            lttb_indices(_x_values(df.index), bb["upper"].to_numpy())
+            if len(df) > DOWNSAMPLE_THRESHOLD else np.arange(len(df))
+        )
+        bb_x, bb_upper = _thin(bb["upper"], bb_idx)
+        _,    bb_lower = _thin(bb["lower"], bb_idx)
+        layers.append((go.Scatter(
+            x=bb_x, y=_f32(bb_upper),
             name="BB Upper", line=dict(color="rgba(139,92,246,0.4)", width=1, dash="dot"),
-            showlegend=False,
-        ), row=1, col=1)
-        fig.add_trace(go.Scatter(
-            x=df.index, y=bb["lower"],
+            showlegend=False, connectgaps=False,
+        ), 1))
+        layers.append((go.Scatter(
+            x=bb_x, y=_f32(bb_lower),
             name="BB Lower", line=dict(color="rgba(139,92,246,0.4)", width=1, dash="dot"),
             fill="tonexty", fillcolor="rgba(139,92,246,0.05)",
-            showlegend=False,
-        ), row=1, col=1)
+            showlegend=False, connectgaps=False,
+        ), 1))
 
     # ── Moving Averages ──
-    if ma20 is not None:
-        fig.add_trace(go.Scatter(x=ma20.index, y=ma20, name="MA20",
-            line=dict(color="#3b82f6", width=1.5, dash="dot")), row=1, col=1)
-    if ma50 is not None:
-        fig.add_trace(go.Scatter(x=ma50.index, y=ma50, name="MA50",
-            line=dict(color="#f59e0b", width=1.5)), row=1, col=1)
-    if ma200 is not None and len(df) >= 200:
-        fig.add_trace(go.Scatter(x=ma200.index, y=ma200, name="MA200",
-            line=dict(color="#8b5cf6", width=1.5, dash="dash")), row=1, col=1)
+    if _plottable(ma20):
+        x, y = _thin(ma20)
+        layers.append((go.Scatter(x=x, y=_f32(y), name="MA20", connectgaps=False,
+            line=dict(color="#3b82f6", width=1.5, dash="dot")), 1))
+    if _plottable(ma50):
+        x, y = _thin(ma50)
+        layers.append((go.Scatter(x=x, y=_f32(y), name="MA50", connectgaps=False,
+            line=dict(color="#f59e0b", width=1.5)), 1))
+    if _plottable(ma200):
+        x, y = _thin(ma200)
+        layers.append((go.Scatter(x=x, y=_f32(y), name="MA200", connectgaps=False,
+            line=dict(color="#8b5cf6", width=1.5, dash="dash")), 1))
 
     # ── RSI ──
-    if rsi is not None:
-        fig.add_trace(go.Scatter(
-            x=rsi.index, y=rsi, name="RSI",
+    if _plottable(rsi):
+        x, y = _thin(rsi)
+        layers.append((go.Scatter(
+            x=x, y=_f32(y), name="RSI", connectgaps=False,
             line=dict(color="#00d4aa", width=1.5),
-        ), row=2, col=1)
-        fig.add_hline(y=70, line_dash="dot", line_color="#f43f5e", opacity=0.6, row=2, col=1)
-        fig.add_hline(y=30, line_dash="dot", line_color="#00d4aa", opacity=0.6, row=2, col=1)
+        ), 2))
 
     # ── MACD ──
     if macd_d:
         macd_line = macd_d.get("macd")
         sig_line  = macd_d.get("signal")
         hist      = macd_d.get("histogram")
-        if hist is not None:
-            hist_colors = ["#00d4aa" if v >= 0 else "#f43f5e" for v in hist.fillna(0)]
-            fig.add_trace(go.Bar(
-                x=hist.index, y=hist,
+        if _plottable(hist):
+            x, hist = _thin(hist)
+            hist_colors = np.where(np.nan_to_num(hist.to_numpy()) >= 0, "#00d4aa", "#f43f5e")
+            layers.append((go.Bar(
+                x=x, y=_f32(hist),
                 name="MACD Hist", marker_color=hist_colors, opacity=0.6,
-            ), row=3, col=1)
-        if macd_line is not None:
-            fig.add_trace(go.Scatter(x=macd_line.index, y=macd_line, name="MACD",
-                line=dict(color="#3b82f6", width=1.5)), row=3, col=1)
-        if sig_line is not None:
-            fig.add_trace(go.Scatter(x=sig_line.index, y=sig_line, name="Signal",
-                line=dict(color="#f59e0b", width=1.5)), row=3, col=1)
+            ), 3))
+        if _plottable(macd_line):
+            x, y = _thin(macd_line)
+            layers.append((go.Scatter(x=x, y=_f32(y), name="MACD", connectgaps=False,
+                line=dict(color="#3b82f6", width=1.5)), 3))
+        if _plottable(sig_line):
+            x, y = _thin(sig_line)
+            layers.append((go.Scatter(x=x, y=_f32(y), name="Signal", connectgaps=False,
+                line=dict(color="#f59e0b", width=1.5)), 3))
+
+    fig = make_subplots(
+        rows=3, cols=1,
+        shared_xaxes=True,
+        row_heights=[0.60, 0.20, 0.20],
+        vertical_spacing=0.03,
+        subplot_titles=("", "RSI (14)", "MACD"),
+    )
+
+    fig.add_traces(
+        [trace for trace, _ in layers],
+        rows=[row for _, row in layers],
+        cols=[1] * len(layers),
+    )
+    if _plottable(rsi):
+        fig.add_hline(y=70, line_dash="dot", line_color="#f43f5e", opacity=0.6, row=2, col=1)
+        fig.add_hline(y=30, line_dash="dot", line_color="#00d4aa", opacity=0.6, row=2, col=1)
 
     fig.update_layout(
         **PLOTLY_THEME,
@@ -130,11 +236,11 @@ def build_overview_chart(
 # VOLUME BAR CHART (standalone)
 # ─────────────────────────────────────────────
 def build_volume_chart(df: pd.DataFrame) -> go.Figure:
-    close  = df["Close"].squeeze()
-    open_  = df["Open"].squeeze()
-    colors = ["#00d4aa" if c >= o else "#f43f5e" for c, o in zip(close, open_)]
+    close  = df["Close"].to_numpy()
+    open_  = df["Open"].to_numpy()
+    colors = np.where(close >= open_, "#00d4aa", "#f43f5e")
     fig = go.Figure(go.Bar(
-        x=df.index, y=df["Volume"].squeeze(),
+        x=df.index, y=_f32(df["Volume"]),
         marker_color=colors, opacity=0.7, name="Volume",
     ))
     _apply_theme(fig, height=200)
@@ -145,19 +251,25 @@ def build_volume_chart(df: pd.DataFrame) -> go.Figure:
 # ─────────────────────────────────────────────
 # COMPARISON: RELATIVE RETURN LINE CHART
 # ─────────────────────────────────────────────
+@_cached_figure
 def build_comparison_chart(
-    all_data:     dict[str, pd.Series],
+    prices:       pd.DataFrame,
     period_label: str,
 ) -> go.Figure:
-    fig = go.Figure()
-    for i, (ticker, series) in enumerate(all_data.items()):
-        rel = (series / series.iloc[0]) * 100
-        fig.add_trace(go.Scatter(
-            x=rel.index, y=rel,
+    # Each column of the aligned (T, N) frame divided by its first valid close
+    rel    = prices.div(prices.bfill().iloc[0]) * 100.0
+    x      = rel.index.to_numpy()
+
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=x, y=_f32(rel[ticker]),
             name=ticker,
+            connectgaps=True,
             line=dict(color=COLORS[i % len(COLORS)], width=2),
             hovertemplate=f"<b>{ticker}</b><br>%{{x|%b %d, %Y}}<br>Return: %{{y:.1f}}<extra></extra>",
-        ))
+        )
+        for i, ticker in enumerate(rel.columns)
+    ])
     fig.add_hline(y=100, line_dash="dot", line_color="#475569",
                   opacity=0.6, annotation_text="Baseline (100)")
     fig.update_layout(
@@ -174,15 +286,19 @@ def build_comparison_chart(
 # ─────────────────────────────────────────────
 # COMPARISON: TOTAL RETURN BAR
 # ─────────────────────────────────────────────
-def build_return_bar(all_data: dict[str, pd.Series]) -> go.Figure:
-    returns = {t: float((s.iloc[-1] / s.iloc[0] - 1) * 100) for t, s in all_data.items()}
-    sorted_r = dict(sorted(returns.items(), key=lambda x: x[1], reverse=True))
-    colors   = ["#00d4aa" if v >= 0 else "#f43f5e" for v in sorted_r.values()]
+def build_return_bar(prices: pd.DataFrame) -> go.Figure:
+    tickers = prices.columns.to_numpy()
+    first   = prices.bfill().to_numpy(dtype=np.float64)[0]    # first valid close per column
+    last    = prices.ffill().to_numpy(dtype=np.float64)[-1]   # last valid close per column
+    rets    = (last / first - 1.0) * 100.0
+    order   = np.argsort(-rets, kind="stable")
+    rets    = rets[order]
+    colors  = np.where(rets >= 0, "#00d4aa", "#f43f5e")
     fig = go.Figure(go.Bar(
-        x=list(sorted_r.keys()),
-        y=list(sorted_r.values()),
+        x=tickers[order],
+        y=rets,
         marker_color=colors,
-        text=[f"{v:+.1f}%" for v in sorted_r.values()],
+        text=[f"{v:+.1f}%" for v in rets],
         textposition="outside",
         textfont=dict(color="#e2e8f0"),
     ))
@@ -198,7 +314,10 @@ def build_return_bar(all_data: dict[str, pd.Series]) -> go.Figure:
 # ─────────────────────────────────────────────
 # COMPARISON: CORRELATION HEATMAP
 # ─────────────────────────────────────────────
+@_cached_figure
 def build_correlation_heatmap(corr_df: pd.DataFrame) -> go.Figure:
+    import plotly.express as px  # heavy import, only needed for this chart
+
     fig = px.imshow(
         corr_df,
         color_continuous_scale="RdBu_r",
@@ -218,55 +337,61 @@ def build_correlation_heatmap(corr_df: pd.DataFrame) -> go.Figure:
 # ─────────────────────────────────────────────
 # AI PREDICTION CHART
 # ─────────────────────────────────────────────
+@_cached_figure
 def build_prediction_chart(
     hist_df:       pd.DataFrame,
     hist_pred:     np.ndarray,
     future_dates:  pd.DatetimeIndex,
     future_prices: np.ndarray,
     model_name:    str,
+    hist_close:    np.ndarray | None = None,
 ) -> go.Figure:
-    hist_close = hist_df["Close"].squeeze()
+    """`hist_close` may be passed pre-extracted (aligned with hist_df)."""
+    if hist_close is None:
+        hist_close = hist_df["Close"].to_numpy(dtype=np.float64).ravel()
     last_date  = hist_df.index[-1]
 
     upper = future_prices * 1.05
     lower = future_prices * 0.95
 
-    fig = go.Figure()
+    traces = []
 
     # ── Historical actual ──
-    fig.add_trace(go.Scatter(
-        x=hist_df.index, y=hist_close,
+    x, y = _thin(pd.Series(hist_close, index=hist_df.index))
+    traces.append(go.Scatter(
+        x=x, y=_f32(y),
         name="Actual Price",
         line=dict(color="#3b82f6", width=2),
         fill="tozeroy", fillcolor="rgba(59,130,246,0.05)",
     ))
 
     # ── In-sample model fit ──
-    valid_mask = ~np.isnan(hist_pred[-len(hist_df):])
     hist_pred_slice = hist_pred[-len(hist_df):]
-    if valid_mask.any():
-        fig.add_trace(go.Scatter(
-            x=hist_df.index[valid_mask],
-            y=hist_pred_slice[valid_mask],
+    valid_mask      = np.isfinite(hist_pred_slice)
+    if np.count_nonzero(valid_mask) >= 2:
+        x, y = _thin(pd.Series(hist_pred_slice[valid_mask], index=hist_df.index[valid_mask]))
+        traces.append(go.Scatter(
+            x=x,
+            y=_f32(y),
             name=f"{model_name} Fit",
             line=dict(color="#f59e0b", width=1.5, dash="dot"),
             opacity=0.75,
         ))
 
     # ── Confidence band ──
-    fig.add_trace(go.Scatter(
-        x=list(future_dates) + list(future_dates[::-1]),
-        y=list(upper) + list(lower[::-1]),
+    traces.append(go.Scatter(
+        x=np.concatenate([future_dates.values, future_dates.values[::-1]]),
+        y=_f32(np.concatenate([upper, lower[::-1]])),
         fill="toself", fillcolor="rgba(0,212,170,0.08)",
         line=dict(color="rgba(0,212,170,0)"),
         name="±5% Band",
     ))
 
     # ── Forecast line (bridged from last actual) ──
-    bridge_x = [last_date] + list(future_dates)
-    bridge_y = [float(hist_close.iloc[-1])] + list(future_prices)
-    fig.add_trace(go.Scatter(
-        x=bridge_x, y=bridge_y,
+    bridge_x = np.concatenate([[pd.Timestamp(last_date).to_datetime64()], future_dates.values])
+    bridge_y = np.concatenate([[hist_close[-1]], future_prices])
+    traces.append(go.Scatter(
+        x=bridge_x, y=_f32(bridge_y),
         name="Forecast",
         line=dict(color="#00d4aa", width=2.5, dash="dash"),
         mode="lines+markers",
@@ -276,7 +401,7 @@ def build_prediction_chart(
     # ── "Today" vertical line as Scatter ──
     y_min = float(min(float(hist_close.min()), float(future_prices.min())) * 0.97)
     y_max = float(max(float(hist_close.max()), float(future_prices.max())) * 1.03)
-    fig.add_trace(go.Scatter(
+    traces.append(go.Scatter(
         x=[last_date, last_date],
         y=[y_min, y_max],
         mode="lines+text",
@@ -288,6 +413,7 @@ def build_prediction_chart(
         hoverinfo="skip",
     ))
 
+    fig = go.Figure(data=traces)
     fig.update_layout(
         **PLOTLY_THEME,
         height=500,
@@ -302,6 +428,7 @@ def build_prediction_chart(
 # ─────────────────────────────────────────────
 # FEATURE IMPORTANCE BAR
 # ─────────────────────────────────────────────
+@_cached_figure
 def build_feature_importance_chart(
     names:        list[str],
     importances:  np.ndarray,
@@ -6,42 +6,149 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 
-from utils.config import STOCKS, PERIOD_MAP
+from utils.config import STOCKS, STOCK_LABELS, PERIOD_MAP, PERIOD_LABELS
 
 
 # ─────────────────────────────────────────────
 # MATERIAL ICON HELPER
 # ─────────────────────────────────────────────
+@lru_cache(maxsize=256)
 def icon(name: str, size: str = "18px", color: str = "inherit") -> str:
-    """Returns HTML span for Material Symbols icon."""
+    """Returns HTML span for Material Symbols icon (memoized per argument triple)."""
     return f'<span class="material-symbols-outlined" style="font-size:{size};color:{color};vertical-align:middle">{name}</span>'
 
 
+# ─────────────────────────────────────────────
+# STATIC HTML
+# Built once at import; the rerun path only fills in runtime values via
+# str.format on these templates.
+# ─────────────────────────────────────────────
+_SIDEBAR_BRAND_HTML = f"""
+    <div style="text-align:center;padding:16px 0 12px">
+        <span style="font-family:'Space Mono',monospace;font-size:1.5rem;
+                     font-weight:700;color:#00d4aa;display:flex;align-items:center;justify-content:center;gap:8px">
+            {icon('show_chart', '28px', '#00d4aa')} MarketLens
+        </span>
+        <span style="color:#64748b;font-size:0.75rem;letter-spacing:0.5px">AI Stock Analysis Platform</span>
+    </div>
+    """
+
+_SECTION_STOCKS_HTML  = f'#### {icon("search", "20px", "#94a3b8")} Stock Selection'
+_SECTION_PERIOD_HTML  = f'#### {icon("calendar_month", "20px", "#94a3b8")} Time Period'
+_SECTION_PRIMARY_HTML = f'#### {icon("target", "20px", "#94a3b8")} Primary Analysis'
+
+
+def _card_title(icon_name: str, title: str, margin: str = "8px") -> str:
+    """Icon + title row shared by the signal-panel cards."""
+    return f"""
+    <div style="display:flex;align-items:center;gap:8px;margin-bottom:{margin}">
+        {icon(icon_name, "20px", "#94a3b8")}
+        <span style="font-weight:600;color:#e2e8f0">{title}</span>
+    </div>"""
+
+
+_STRENGTH_CARD_TMPL = _card_title("sensors", "Market Strength") + """
+    <p style="font-size:1.1rem;color:{color};font-weight:600;margin:4px 0;display:flex;align-items:center;gap:6px">
+        {icon} {strength}
+    </p>
+    <p style="color:#94a3b8;font-size:0.85rem;margin:0">
+        Price <b style="color:#e2e8f0">${last:.2f}</b> vs MA50 <b style="color:#e2e8f0">${ma50:.2f}</b>
+    </p>
+    """
+
+_STRENGTH_ICON_HTML = {
+    True:  icon("trending_up",   "20px", "#00d4aa"),
+    False: icon("trending_down", "20px", "#f43f5e"),
+}
+
+_CROSSOVER_CARD_TMPL = _card_title("compare_arrows", "MA Crossover Signal") + """
+    <p style="color:#94a3b8;font-size:0.85rem;margin:4px 0">MA20 vs MA50:</p>
+    <div style="margin:8px 0">{badge}</div>
+    """
+
+_RSI_CARD_TMPL = _card_title("speed", "RSI Signal") + """
+    <p style="font-size:1.1rem;color:{color};font-weight:600;margin:4px 0">{label}</p>
+    <p style="color:#94a3b8;font-size:0.85rem;margin:0">
+        RSI(14) = <b style="color:{color}">{value:.1f}</b>
+    </p>
+    """
+
+_RANGE_CARD_TMPL = _card_title("straighten", "52-Week Range") + """
+    <div style="background:#1e293b;border-radius:6px;height:8px;margin:12px 0;overflow:hidden">
+        <div style="background:linear-gradient(90deg,#3b82f6,#00d4aa);width:{pct:.1f}%;height:100%;border-radius:6px"></div>
+    </div>
+    <p style="color:#94a3b8;font-size:0.8rem;margin:0">{pct:.1f}% from 52-week low</p>
+    """
+
+_PROFILE_CARD_TMPL = _card_title("business", "Company Profile") + """
+    <p style="color:#94a3b8;font-size:0.85rem;margin:4px 0">
+        <b style="color:#e2e8f0">Sector:</b> {sector}
+    </p>
+    <p style="color:#64748b;font-size:0.82rem;margin:4px 0;line-height:1.4">
+        {summary}...
+    </p>
+    """
+
+_NEWS_TITLE_HTML = _card_title("article", "Latest News", margin="12px")
+
+_NEWS_ITEM_TMPL = """
+    <div style="padding:8px 0;border-bottom:1px solid #1e293b">
+        <a href="{url}" target="_blank" style="color:#60a5fa;text-decoration:none;font-size:0.85rem;line-height:1.4">
+            {title}
+        </a>
+    </div>
+    """
+
+_BADGE_TMPL = """
+    <span style="display:inline-flex;align-items:center;gap:4px;padding:6px 12px;
+                 background:{bg};color:{fg};border-radius:6px;
+                 font-weight:600;font-size:0.9rem">
+        {icon} {label}
+    </span>"""
+
+_SIGNAL_BADGES = {
+    label: _BADGE_TMPL.format(bg=bg, fg=fg, icon=icon(name, "16px", fg), label=label)
+    for label, name, bg, fg in (
+        ("BUY",  "arrow_upward",   "rgba(0,212,170,0.15)",   "#00d4aa"),
+        ("SELL", "arrow_downward", "rgba(244,63,94,0.15)",   "#f43f5e"),
+        ("HOLD", "remove",         "rgba(148,163,184,0.15)", "#94a3b8"),
+    )
+}
+
+_HEADER_TMPL = f"""
+    <div style="display:flex;align-items:center;gap:12px;padding:24px 0 16px;
+                border-bottom:1px solid #1e293b;margin-bottom:24px">
+        <div>
+            <p style="font-family:'Space Mono',monospace;font-size:1.8rem;font-weight:700;
+                      color:#00d4aa;margin:0;display:flex;align-items:center;gap:10px">
+                {icon('show_chart', '32px', '#00d4aa')} MarketLens
+            </p>
+            <p style="color:#64748b;font-size:0.85rem;margin:4px 0 0;letter-spacing:0.3px">
+                AI-Powered Stock Analysis Platform &nbsp;|&nbsp; {{date_str}}
+            </p>
+        </div>
+    </div>
+    """
+
+
 # ─────────────────────────────────────────────
 # SIDEBAR
 # ─────────────────────────────────────────────
 def render_sidebar() -> dict:
     """Render sidebar with stock selection and settings."""
     with st.sidebar:
-        st.markdown(f"""
-        <div style="text-align:center;padding:16px 0 12px">
-            <span style="font-family:'Space Mono',monospace;font-size:1.5rem;
-                         font-weight:700;color:#00d4aa;display:flex;align-items:center;justify-content:center;gap:8px">
-                {icon('show_chart', '28px', '#00d4aa')} MarketLens
-            </span>
-            <span style="color:#64748b;font-size:0.75rem;letter-spacing:0.5px">AI Stock Analysis Platform</span>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_BRAND_HTML, unsafe_allow_html=True)
         
         st.markdown("---")
 
         # Stock Selection Section
-        st.markdown(f'#### {icon("search", "20px", "#94a3b8")} Stock Selection', unsafe_allow_html=True)
+        st.markdown(_SECTION_STOCKS_HTML, unsafe_allow_html=True)
         
         selected_labels = st.multiselect(
             "Select up to 10 stocks",
-            options=list(STOCKS.keys()),
+            options=STOCK_LABELS,
             default=["Apple (AAPL)", "Microsoft (MSFT)", "NVIDIA (NVDA)"],
             max_selections=10,
         )
@@ -55,11 +162,11 @@ def render_sidebar() -> dict:
         st.markdown("")
         
         # Time Period Section
-        st.markdown(f'#### {icon("calendar_month", "20px", "#94a3b8")} Time Period', unsafe_allow_html=True)
+        st.markdown(_SECTION_PERIOD_HTML, unsafe_allow_html=True)
         
         period_label = st.selectbox(
             "Historical data window",
-            list(PERIOD_MAP.keys()),
+            PERIOD_LABELS,
             index=0,
         )
         period = PERIOD_MAP[period_label]
@@ -67,7 +174,7 @@ def render_sidebar() -> dict:
         st.markdown("")
         
         # Primary Stock Section
-        st.markdown(f'#### {icon("target", "20px", "#94a3b8")} Primary Analysis', unsafe_allow_html=True)
+        st.markdown(_SECTION_PRIMARY_HTML, unsafe_allow_html=True)
         
         primary_label = st.selectbox(
             "Select stock for detailed analysis",
@@ -76,13 +183,6 @@ def render_sidebar() -> dict:
         )
         primary_ticker = STOCKS[primary_label]
 
-        st.markdown("")
-        
-        # Chart Options Section
-        st.markdown(f'#### {icon("tune", "20px", "#94a3b8")} Chart Options', unsafe_allow_html=True)
-        
-        show_bb = st.toggle("Show Bollinger Bands", value=True)
-
         st.markdown("---")
         
         if st.button("Refresh Data", use_container_width=True, type="secondary"):
@@ -96,7 +196,6 @@ def render_sidebar() -> dict:
         "period": period,
         "primary_label": primary_label,
         "primary_ticker": primary_ticker,
-        "show_bb": show_bb,
     }
 
 
@@ -167,8 +266,9 @@ def render_kpi_row(ticker: str, signals: dict, info: dict) -> None:
         )
 
 
+@lru_cache(maxsize=256)
 def _format_market_cap(mktcap) -> str:
-    """Format market cap to human-readable string."""
+    """Format market cap to human-readable string (memoized; caps are stable per session)."""
     if not mktcap:
         return "N/A"
     if mktcap >= 1e12:
@@ -194,32 +294,19 @@ def render_signal_panel(signals: dict, info: dict, news: list) -> None:
     # Market Strength Card
     is_bullish = "Bull" in strength
     strength_color = "#00d4aa" if is_bullish else "#f43f5e"
-    strength_icon = "trending_up" if is_bullish else "trending_down"
-    
+
     with st.container(border=True):
-        st.markdown(f"""
-        <div style="display:flex;align-items:center;gap:8px;margin-bottom:8px">
-            {icon('sensors', '20px', '#94a3b8')}
-            <span style="font-weight:600;color:#e2e8f0">Market Strength</span>
-        </div>
-        <p style="font-size:1.1rem;color:{strength_color};font-weight:600;margin:4px 0;display:flex;align-items:center;gap:6px">
-            {icon(strength_icon, '20px', strength_color)} {strength}
-        </p>
-        <p style="color:#94a3b8;font-size:0.85rem;margin:0">
-            Price <b style="color:#e2e8f0">${last:.2f}</b> vs MA50 <b style="color:#e2e8f0">${ma50_val:.2f}</b>
-        </p>
-        """, unsafe_allow_html=True)
+        st.markdown(_STRENGTH_CARD_TMPL.format(
+            color=strength_color,
+            icon=_STRENGTH_ICON_HTML[is_bullish],
+            strength=strength,
+            last=last,
+            ma50=ma50_val,
+        ), unsafe_allow_html=True)
 
     # MA Crossover Signal Card
     with st.container(border=True):
-        st.markdown(f"""
-        <div style="display:flex;align-items:center;gap:8px;margin-bottom:8px">
-            {icon('compare_arrows', '20px', '#94a3b8')}
-            <span style="font-weight:600;color:#e2e8f0">MA Crossover Signal</span>
-        </div>
-        <p style="color:#94a3b8;font-size:0.85rem;margin:4px 0">MA20 vs MA50:</p>
-        <div style="margin:8px 0">{_render_signal_badge(sig)}</div>
-        """, unsafe_allow_html=True)
+        st.markdown(_CROSSOVER_CARD_TMPL.format(badge=_render_signal_badge(sig)), unsafe_allow_html=True)
 
     # RSI Signal Card
     if rsi_val > 70:
@@ -230,16 +317,9 @@ def render_signal_panel(signals: dict, info: dict, news: list) -> None:
         rsi_color = "#f59e0b"
     
     with st.container(border=True):
-        st.markdown(f"""
-        <div style="display:flex;align-items:center;gap:8px;margin-bottom:8px">
-            {icon('speed', '20px', '#94a3b8')}
-            <span style="font-weight:600;color:#e2e8f0">RSI Signal</span>
-        </div>
-        <p style="font-size:1.1rem;color:{rsi_color};font-weight:600;margin:4px 0">{rsi_signal}</p>
-        <p style="color:#94a3b8;font-size:0.85rem;margin:0">
-            RSI(14) = <b style="color:{rsi_color}">{rsi_val:.1f}</b>
-        </p>
-        """, unsafe_allow_html=True)
+        st.markdown(_RSI_CARD_TMPL.format(
+            color=rsi_color, label=rsi_signal, value=rsi_val,
+        ), unsafe_allow_html=True)
 
     # 52-Week Range Card
     low52 = info.get("fiftyTwoWeekLow")
@@ -249,52 +329,25 @@ def render_signal_panel(signals: dict, info: dict, news: list) -> None:
         pct = min(100, max(0, (last - low52) / (high52 - low52) * 100))
         
         with st.container(border=True):
-            st.markdown(f"""
-            <div style="display:flex;align-items:center;gap:8px;margin-bottom:8px">
-                {icon('straighten', '20px', '#94a3b8')}
-                <span style="font-weight:600;color:#e2e8f0">52-Week Range</span>
-            </div>
-            <div style="background:#1e293b;border-radius:6px;height:8px;margin:12px 0;overflow:hidden">
-                <div style="background:linear-gradient(90deg,#3b82f6,#00d4aa);width:{pct:.1f}%;height:100%;border-radius:6px"></div>
-            </div>
-            <p style="color:#94a3b8;font-size:0.8rem;margin:0">{pct:.1f}% from 52-week low</p>
-            """, unsafe_allow_html=True)
+            st.markdown(_RANGE_CARD_TMPL.format(pct=pct), unsafe_allow_html=True)
 
     # Company Profile Card
     with st.container(border=True):
-        st.markdown(f"""
-        <div style="display:flex;align-items:center;gap:8px;margin-bottom:8px">
-            {icon('business', '20px', '#94a3b8')}
-            <span style="font-weight:600;color:#e2e8f0">Company Profile</span>
-        </div>
-        <p style="color:#94a3b8;font-size:0.85rem;margin:4px 0">
-            <b style="color:#e2e8f0">Sector:</b> {info.get('sector', 'N/A')}
-        </p>
-        <p style="color:#64748b;font-size:0.82rem;margin:4px 0;line-height:1.4">
-            {info.get('longBusinessSummary', '')[:180]}...
-        </p>
-        """, unsafe_allow_html=True)
+        st.markdown(_PROFILE_CARD_TMPL.format(
+            sector=info.get('sector', 'N/A'),
+            summary=info.get('_shortBusinessSummary') or info.get('longBusinessSummary', '')[:180],
+        ), unsafe_allow_html=True)
 
     # News Section
     if news:
         with st.container(border=True):
-            st.markdown(f"""
-            <div style="display:flex;align-items:center;gap:8px;margin-bottom:12px">
-                {icon('article', '20px', '#94a3b8')}
-                <span style="font-weight:600;color:#e2e8f0">Latest News</span>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_NEWS_TITLE_HTML, unsafe_allow_html=True)
             
             for item in news[:3]:
-                title = item.get('title', '')
-                url = item.get('url', '#')
-                st.markdown(f"""
-                <div style="padding:8px 0;border-bottom:1px solid #1e293b">
-                    <a href="{url}" target="_blank" style="color:#60a5fa;text-decoration:none;font-size:0.85rem;line-height:1.4">
-                        {title}
-                    </a>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_NEWS_ITEM_TMPL.format(
+                    url=item.get('url', '#'),
+                    title=item.get('title', ''),
+                ), unsafe_allow_html=True)
 
 
 # ─────────────────────────────────────────────
@@ -302,44 +355,12 @@ def render_signal_panel(signals: dict, info: dict, news: list) -> None:
 # ─────────────────────────────────────────────
 def _render_signal_badge(signal: str) -> str:
     """Return HTML badge for trading signal."""
-    if signal == "BUY":
-        return f'''
-        <span style="display:inline-flex;align-items:center;gap:4px;padding:6px 12px;
-                     background:rgba(0,212,170,0.15);color:#00d4aa;border-radius:6px;
-                     font-weight:600;font-size:0.9rem">
-            {icon('arrow_upward', '16px', '#00d4aa')} BUY
-        </span>'''
-    elif signal == "SELL":
-        return f'''
-        <span style="display:inline-flex;align-items:center;gap:4px;padding:6px 12px;
-                     background:rgba(244,63,94,0.15);color:#f43f5e;border-radius:6px;
-                     font-weight:600;font-size:0.9rem">
-            {icon('arrow_downward', '16px', '#f43f5e')} SELL
-        </span>'''
-    return f'''
-    <span style="display:inline-flex;align-items:center;gap:4px;padding:6px 12px;
-                 background:rgba(148,163,184,0.15);color:#94a3b8;border-radius:6px;
-                 font-weight:600;font-size:0.9rem">
-        {icon('remove', '16px', '#94a3b8')} HOLD
-    </span>'''
+    return _SIGNAL_BADGES.get(signal, _SIGNAL_BADGES["HOLD"])
 
 
 def render_header(date_str: str) -> None:
     """Render main application header."""
-    st.markdown(f"""
-    <div style="display:flex;align-items:center;gap:12px;padding:24px 0 16px;
-                border-bottom:1px solid #1e293b;margin-bottom:24px">
-        <div>
-            <p style="font-family:'Space Mono',monospace;font-size:1.8rem;font-weight:700;
-                      color:#00d4aa;margin:0;display:flex;align-items:center;gap:10px">
-                {icon('show_chart', '32px', '#00d4aa')} MarketLens
-            </p>
-            <p style="color:#64748b;font-size:0.85rem;margin:4px 0 0;letter-spacing:0.3px">
-                AI-Powered Stock Analysis Platform &nbsp;|&nbsp; {date_str}
-            </p>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_TMPL.format(date_str=date_str), unsafe_allow_html=True)
 
 
 def render_forecast_table(
@@ -349,23 +370,22 @@ def render_forecast_table(
     every_n: int = 5,
 ) -> None:
     """Render forecast schedule table."""
-    rows = []
-    
-    for i, (date, price) in enumerate(zip(future_dates, future_prices)):
-        if i % every_n == 0 or i == len(future_prices) - 1:
-            change = (price - current_price) / current_price * 100
-            trend = "+" if change >= 0 else "-"
-            
-            rows.append({
-                "Day": i + 1,
-                "Date": date.strftime("%b %d, %Y"),
-                "Predicted Close": f"${price:.2f}",
-                "Change": f"{change:+.2f}%",
-                "Trend": trend,
-            })
-    
+    prices = np.asarray(future_prices, dtype=np.float64)
+    n      = len(prices)
+    idx    = np.unique(np.r_[np.arange(0, n, every_n), n - 1]) if n else np.arange(0)
+    kept   = prices[idx]
+    change = (kept - current_price) / current_price * 100
+
+    table = pd.DataFrame({
+        "Day":             idx + 1,
+        "Date":            pd.DatetimeIndex(future_dates)[idx].strftime("%b %d, %Y"),
+        "Predicted Close": pd.Series(kept).map("${:.2f}".format),
+        "Change":          pd.Series(change).map("{:+.2f}%".format),
+        "Trend":           np.where(change >= 0, "+", "-"),
+    })
+
     st.dataframe(
-        pd.DataFrame(rows),
+        table,
         use_container_width=True,
         hide_index=True,
         column_config={
@@ -0,0 +1,26 @@
+"""Shared fixtures: make the app's packages importable and build OHLCV frames."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    """Deterministic 300-bar daily OHLCV random walk."""
+    rng   = np.random.default_rng(0)
+    idx   = pd.bdate_range("2023-01-02", periods=300)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx))))
+    open_ = close * (1 + rng.normal(0, 0.003, len(idx)))
+    return pd.DataFrame({
+        "Open":   open_,
+        "High":   np.maximum(open_, close) * 1.01,
+        "Low":    np.minimum(open_, close) * 0.99,
+        "Close":  close,
+        "Volume": rng.integers(1_000_000, 5_000_000, len(idx)).astype(float),
+    }, index=idx)
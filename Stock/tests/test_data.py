@@ -0,0 +1,42 @@
+"""Tests for utils.data's OHLCV caching."""
+
+from unittest import mock
+
+import pandas as pd
+
+from utils import data
+
+
+def test_empty_download_is_not_cached(ohlcv):
+    responses = [pd.DataFrame(), ohlcv]
+    calls = []
+
+    def download(ticker, period, **kwargs):
+        calls.append(period)
+        return responses.pop(0)
+
+    data.fetch_ohlcv.clear()
+    data._fetch_ohlcv_daily.clear()
+    with mock.patch.object(data.yf, "download", side_effect=download):
+        assert data.fetch_ohlcv("AAPL", "6mo").empty
+        data.fetch_ohlcv.clear()          # next TTL window
+        assert len(data.fetch_ohlcv("AAPL", "6mo")) == len(ohlcv)
+    # The failed full-period download was retried, not served from cache
+    assert calls == ["6mo", "6mo"]
+
+
+def test_info_many_fetches_only_uncached_tickers():
+    fetched = []
+
+    def one_info(ticker):
+        fetched.append(ticker)
+        return {"sector": f"sector-{ticker}"}
+
+    data.fetch_info.clear()
+    data._fetch_info_persisted.clear()
+    with mock.patch.object(data, "_fetch_one_info", side_effect=one_info):
+        first = data.fetch_info_many(("AAPL", "MSFT"))
+        again = data.fetch_info_many(("NVDA", "MSFT", "AAPL"))
+    assert first == {"AAPL": {"sector": "sector-AAPL"}, "MSFT": {"sector": "sector-MSFT"}}
+    assert list(again) == ["NVDA", "MSFT", "AAPL"]
+    assert sorted(fetched) == ["AAPL", "MSFT", "NVDA"]
@@ -0,0 +1,44 @@
+"""Tests for utils.model's forecast rollout."""
+
+import numpy as np
+
+from utils import model as model_mod
+
+
+def test_rollout_rows_carry_the_predicted_dates_calendar(ohlcv, monkeypatch):
+    # Record every row the rollout predicts on. The random forest trains
+    # on unscaled features, so the recorded calendar columns are raw values.
+    seen = []
+    real = model_mod._row_predictor
+
+    def recording(model):
+        predict = real(model)
+
+        def wrapped(row2d):
+            seen.append(row2d[0].copy())
+            return predict(row2d)
+        return wrapped
+
+    monkeypatch.setattr(model_mod, "_row_predictor", recording)
+    result = model_mod.train_and_predict(ohlcv, "Random Forest", pred_days=10)
+
+    names = result.feature_names
+    rows  = np.array(seen)
+    assert len(rows) == 10
+    np.testing.assert_array_equal(
+        rows[:, names.index("day_of_week")], result.future_dates.dayofweek
+    )
+    np.testing.assert_array_equal(
+        rows[:, names.index("month")], result.future_dates.month
+    )
+
+
+def test_gradient_boosting_reports_permutation_importances(ohlcv):
+    result = model_mod.train_and_predict(ohlcv, "Gradient Boosting", pred_days=5)
+
+    fi = result.feature_importances
+    assert fi is not None
+    assert fi.shape == (len(result.feature_names),)
+    assert (fi >= 0).all()
+    assert np.isclose(fi.sum(), 1.0) or not fi.any()
+    assert np.isfinite(result.future_prices).all()
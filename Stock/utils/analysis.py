@@ -3,23 +3,44 @@ analysis.py — All technical indicators and signal logic.
 
 Functions:
   compute_moving_averages   → MA20, MA50, MA200
-  compute_rsi               → 14-period RSI
+  compute_rsi               → 14-period Wilder RSI
   compute_macd              → MACD line, signal, histogram
   compute_bollinger_bands   → Upper, middle, lower bands
   compute_signals           → Consolidated dict with strength + crossover signal
   compute_returns           → Relative return series (base=100)
   compute_performance_table → Summary stats for comparison tab
   compute_correlation       → Pairwise correlation matrix
+
+The rolling/EWM indicators run on the Numba kernels in utils.kernels when
+Numba is installed and the series is NaN-free; otherwise they fall back to
+the equivalent pandas expressions.
 """
 
 import pandas as pd
 import numpy as np
 
+from utils import kernels
+from utils.jit import NUMBA_AVAILABLE, kernel_array
+
+
+def _kernel_input(close: pd.Series) -> np.ndarray | None:
+    """float64 view of `close` if the Numba path applies, else None."""
+    if not NUMBA_AVAILABLE:
+        return None
+    arr = kernel_array(close.to_numpy())
+    return None if np.isnan(arr).any() else arr
+
 
 # ─────────────────────────────────────────────
 # MOVING AVERAGES
 # ─────────────────────────────────────────────
 def compute_moving_averages(close: pd.Series) -> dict[str, pd.Series]:
+    arr = _kernel_input(close)
+    if arr is not None:
+        return {
+            f"MA{n}": pd.Series(kernels.rolling_mean(arr, n), index=close.index)
+            for n in (20, 50, 200)
+        }
     return {
         "MA20":  close.rolling(20).mean(),
         "MA50":  close.rolling(50).mean(),
@@ -31,9 +52,12 @@ def compute_moving_averages(close: pd.Series) -> dict[str, pd.Series]:
 # RSI
 # ─────────────────────────────────────────────
 def compute_rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    arr = _kernel_input(close)
+    if arr is not None:
+        return pd.Series(kernels.rsi(arr, period), index=close.index)
     delta = close.diff()
-    gain  = delta.clip(lower=0).rolling(period).mean()
-    loss  = (-delta.clip(upper=0)).rolling(period).mean()
+    gain  = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    loss  = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
     rs    = gain / loss.replace(0, np.nan)
     return 100 - (100 / (1 + rs))
 
@@ -47,6 +71,14 @@ def compute_macd(
     slow: int = 26,
     signal_period: int = 9,
 ) -> dict[str, pd.Series]:
+    arr = _kernel_input(close)
+    if arr is not None:
+        line, sig, hist = kernels.macd(arr, fast, slow, signal_period)
+        return {
+            "macd":      pd.Series(line, index=close.index),
+            "signal":    pd.Series(sig,  index=close.index),
+            "histogram": pd.Series(hist, index=close.index),
+        }
     ema_fast   = close.ewm(span=fast,   adjust=False).mean()
     ema_slow   = close.ewm(span=slow,   adjust=False).mean()
     macd_line  = ema_fast - ema_slow
@@ -63,6 +95,14 @@ def compute_bollinger_bands(
     period: int = 20,
     num_std: float = 2.0,
 ) -> dict[str, pd.Series]:
+    arr = _kernel_input(close)
+    if arr is not None:
+        upper, middle, lower = kernels.bollinger(arr, period, num_std)
+        return {
+            "upper":  pd.Series(upper,  index=close.index),
+            "middle": pd.Series(middle, index=close.index),
+            "lower":  pd.Series(lower,  index=close.index),
+        }
     middle = close.rolling(period).mean()
     std    = close.rolling(period).std()
     return {
@@ -81,27 +121,56 @@ def compute_signals(df: pd.DataFrame) -> dict:
       last, prev, change_1d, change_1w,
       ma20, ma50, ma200, ma20_val, ma50_val, ma200_val,
       rsi, rsi_val,
-      macd (dict),
+      macd (dict), macd_val, macd_signal_val, macd_hist_val,
       bb (dict),
       strength, signal, rsi_signal
     """
     if df.empty or len(df) < 50:
         return {}
 
-    close = df["Close"].squeeze()
-    mas   = compute_moving_averages(close)
-    rsi   = compute_rsi(close)
-    macd  = compute_macd(close)
-    bb    = compute_bollinger_bands(close)
-
-    last  = float(close.iloc[-1])
-    prev  = float(close.iloc[-2])
-    week_ago = float(close.iloc[-6]) if len(close) >= 6 else prev
-
-    ma20_val  = float(mas["MA20"].iloc[-1])
-    ma50_val  = float(mas["MA50"].iloc[-1])
-    ma200_val = float(mas["MA200"].iloc[-1]) if len(df) >= 200 else None
-    rsi_val   = float(rsi.iloc[-1])
+    close = df["Close"]
+    arr   = _kernel_input(close)
+    if arr is not None:
+        # Fused kernel: one pass over close for every indicator below
+        ma20, ma50, ma200, rsi_a, line, sig, hist, upper, lower = kernels.all_indicators(arr)
+        idx  = close.index
+        mas  = {
+            "MA20":  pd.Series(ma20,  index=idx),
+            "MA50":  pd.Series(ma50,  index=idx),
+            "MA200": pd.Series(ma200, index=idx),
+        }
+        rsi  = pd.Series(rsi_a, index=idx)
+        macd = {
+            "macd":      pd.Series(line, index=idx),
+            "signal":    pd.Series(sig,  index=idx),
+            "histogram": pd.Series(hist, index=idx),
+        }
+        bb   = {
+            "upper":  pd.Series(upper, index=idx),
+            "middle": mas["MA20"],
+            "lower":  pd.Series(lower, index=idx),
+        }
+    else:
+        mas   = compute_moving_averages(close)
+        rsi   = compute_rsi(close)
+        macd  = compute_macd(close)
+        bb    = compute_bollinger_bands(close)
+
+    # Scalars straight from the underlying arrays (no per-field Series indexing)
+    c        = arr if arr is not None else close.to_numpy(dtype=np.float64)
+    ma20_a   = mas["MA20"].to_numpy()
+    ma50_a   = mas["MA50"].to_numpy()
+    last     = float(c[-1])
+    prev     = float(c[-2])
+    week_ago = float(c[-6]) if len(c) >= 6 else prev
+
+    ma20_val  = float(ma20_a[-1])
+    ma50_val  = float(ma50_a[-1])
+    ma200_val = float(mas["MA200"].to_numpy()[-1]) if len(df) >= 200 else None
+    rsi_val   = float(rsi.to_numpy()[-1])
+    macd_val        = float(macd["macd"].to_numpy()[-1])
+    macd_signal_val = float(macd["signal"].to_numpy()[-1])
+    macd_hist_val   = float(macd["histogram"].to_numpy()[-1])
 
     change_1d = (last - prev) / prev * 100
     change_1w = (last - week_ago) / week_ago * 100
@@ -110,8 +179,8 @@ def compute_signals(df: pd.DataFrame) -> dict:
     strength = "Bullish 🟢" if last > ma50_val else "Bearish 🔴"
 
     # MA Crossover signal (MA20 vs MA50)
-    ma20_prev = float(mas["MA20"].iloc[-2])
-    ma50_prev = float(mas["MA50"].iloc[-2])
+    ma20_prev = float(ma20_a[-2])
+    ma50_prev = float(ma50_a[-2])
     if   ma20_val > ma50_val and ma20_prev <= ma50_prev:
         signal = "BUY"
     elif ma20_val < ma50_val and ma20_prev >= ma50_prev:
@@ -131,6 +200,7 @@ def compute_signals(df: pd.DataFrame) -> dict:
         "ma20_val": ma20_val, "ma50_val": ma50_val, "ma200_val": ma200_val,
         "rsi": rsi, "rsi_val": rsi_val, "rsi_signal": rsi_signal,
         "macd": macd, "bb": bb,
+        "macd_val": macd_val, "macd_signal_val": macd_signal_val, "macd_hist_val": macd_hist_val,
         "strength": strength, "signal": signal,
     }
 
@@ -140,20 +210,27 @@ def compute_signals(df: pd.DataFrame) -> dict:
 # ─────────────────────────────────────────────
 def compute_returns(series: pd.Series) -> pd.Series:
     """Normalize to base-100 relative return series."""
-    return (series / series.iloc[0]) * 100
+    arr = series.to_numpy(dtype=np.float64)
+    return pd.Series(arr * (100.0 / arr[0]), index=series.index, name=series.name)
 
 
 def compute_performance_table(
-    all_data: dict[str, pd.Series],
+    prices: pd.DataFrame,
     period_label: str,
 ) -> pd.DataFrame:
     rows = []
-    for ticker, series in all_data.items():
-        total_ret  = (series.iloc[-1] / series.iloc[0] - 1) * 100
-        month_ret  = (series.iloc[-1] / series.iloc[-min(30, len(series))] - 1) * 100
-        week_ret   = (series.iloc[-1] / series.iloc[-min(5,  len(series))] - 1) * 100
-        ann_vol    = series.pct_change().std() * np.sqrt(252) * 100
-        sharpe     = (series.pct_change().mean() * 252) / (series.pct_change().std() * np.sqrt(252) + 1e-9)
+    for ticker, series in prices.items():
+        arr        = series.to_numpy(dtype=np.float64)
+        arr        = arr[~np.isnan(arr)]       # this ticker's own trading days
+        last       = arr[-1]
+        rets       = np.diff(arr) / arr[:-1]
+        mu         = rets.mean()
+        sigma      = rets.std(ddof=1)          # ddof=1 matches Series.std()
+        total_ret  = (last / arr[0] - 1) * 100
+        month_ret  = (last / arr[-min(30, len(arr))] - 1) * 100
+        week_ret   = (last / arr[-min(5,  len(arr))] - 1) * 100
+        ann_vol    = sigma * np.sqrt(252) * 100
+        sharpe     = (mu * 252) / (sigma * np.sqrt(252) + 1e-9)
         rows.append({
             "Ticker":                        ticker,
             f"Total ({period_label})":       f"{total_ret:+.2f}%",
@@ -161,12 +238,16 @@ def compute_performance_table(
             "1-Week":                        f"{week_ret:+.2f}%",
             "Ann. Volatility":               f"{ann_vol:.1f}%",
             "Sharpe (approx)":               f"{sharpe:.2f}",
-            "Current Price":                 f"${float(series.iloc[-1]):.2f}",
+            "Current Price":                 f"${float(last):.2f}",
         })
     return pd.DataFrame(rows).set_index("Ticker")
 
 
-def compute_correlation(all_data: dict[str, pd.Series]) -> pd.DataFrame:
+def compute_correlation(prices: pd.DataFrame) -> pd.DataFrame:
     """Pairwise Pearson correlation of daily returns."""
-    returns = pd.DataFrame({t: s.pct_change() for t, s in all_data.items()}).dropna()
-    return returns.corr()
+    # Dates every ticker traded: the complete panel of the aligned frame
+    panel  = prices.dropna().to_numpy(dtype=np.float64)
+    rets   = panel[1:] / panel[:-1] - 1.0
+    corr   = np.atleast_2d(np.corrcoef(rets, rowvar=False))
+    tickers = list(prices.columns)
+    return pd.DataFrame(corr, index=tickers, columns=tickers)
@@ -26,6 +26,10 @@ STOCKS = {
     "Mastercard (MA)": "MA",
 }
 
+# Immutable views built once for the sidebar widgets
+STOCK_LABELS  = tuple(STOCKS)
+STOCK_SYMBOLS = tuple(STOCKS.values())
+
 # ─────────────────────────────────────────────
 # TIME PERIODS
 # ─────────────────────────────────────────────
@@ -35,6 +39,7 @@ PERIOD_MAP = {
     "2 Years": "2y",
     "5 Years": "5y",
 }
+PERIOD_LABELS = tuple(PERIOD_MAP)
 
 # ─────────────────────────────────────────────
 # COLOR PALETTE
@@ -91,9 +96,7 @@ def get_plotly_layout(**overrides):
     Returns a copy of PLOTLY_THEME merged with any overrides.
     Use this to avoid conflicts when charts need custom settings.
     """
-    layout = PLOTLY_THEME.copy()
-    layout.update(overrides)
-    return layout
+    return {**PLOTLY_THEME, **overrides}
 
 
 # ─────────────────────────────────────────────
@@ -225,6 +228,39 @@ html, body, [class*="css"] {
     box-shadow: 0 2px 8px rgba(59, 130, 246, 0.3);
 }
 
+/* View switcher (radio styled as the tab bar above) */
+.st-key-active_tab [role="radiogroup"] {
+    background: var(--bg-surface-2);
+    border-radius: var(--radius-lg);
+    padding: 6px;
+    gap: 6px;
+    border: 1px solid var(--border-primary);
+}
+
+.st-key-active_tab label[data-baseweb="radio"] {
+    color: var(--text-muted) !important;
+    border-radius: var(--radius-md);
+    font-family: 'DM Sans', sans-serif;
+    font-weight: 500;
+    padding: 10px 24px;
+    margin: 0;
+    transition: var(--transition-fast);
+}
+
+.st-key-active_tab label[data-baseweb="radio"] > div:first-child {
+    display: none;
+}
+
+.st-key-active_tab label[data-baseweb="radio"]:hover {
+    background: rgba(59, 130, 246, 0.1);
+}
+
+.st-key-active_tab label[data-baseweb="radio"]:has(input:checked) {
+    background: var(--accent-secondary) !important;
+    color: white !important;
+    box-shadow: 0 2px 8px rgba(59, 130, 246, 0.3);
+}
+
 /* ══════════════════════════════════════════════
    METRIC CARDS
    ══════════════════════════════════════════════ */
@@ -629,4 +665,5 @@ hr, [data-testid="stDivider"] {
     }
 }
 </style>
-"""
\ No newline at end of file
+"""
+
@@ -6,11 +6,15 @@ which is required to bypass Yahoo Finance's bot detection on shared
 cloud IPs like Streamlit Cloud.
 """
 
+import random
 import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import streamlit as st
 import yfinance as yf
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
 
 try:
     from curl_cffi import requests as curl_requests
@@ -18,7 +22,21 @@ try:
     _CURL_AVAILABLE = True
 except ImportError:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     _SESSION = requests.Session()
+    # Pooled keep-alive connections shared by every ticker, with transient
+    # errors retried with backoff inside urllib3 instead of our loops.
+    _SESSION.mount("https://", HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    ))
     _SESSION.headers.update({
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -31,8 +49,52 @@ except ImportError:
     _CURL_AVAILABLE = False
 
 
+_MAX_FETCH_WORKERS = 10
+# The requests session retries at the transport level; curl_cffi has no
+# equivalent hook, so it keeps the application-level retry loop.
+_FETCH_ATTEMPTS = 3 if _CURL_AVAILABLE else 1
+_TTL = 600
+_RECENT_PERIOD = "5d"     # tail re-fetched each TTL window on top of the daily history
+
+
+def _ttl_bucket() -> int:
+    """Index of the current TTL window.
+
+    Disk-persisted caches ignore ``ttl``, so the window goes into the cache
+    key instead: a restart inside the same window reuses the pickled result,
+    and a new window misses and refetches.
+    """
+    return int(time.time() // _TTL)
+
+
+def _backoff(attempt: int) -> None:
+    """Short jittered sleep before the next attempt; no-op after the last one.
+
+    Yahoo's empty/rate-limited responses usually clear within half a
+    second, and this sleep blocks the user's rerun.
+    """
+    if attempt + 1 < _FETCH_ATTEMPTS:
+        time.sleep(0.2 + random.random() * 0.3 * (attempt + 1))
+
+
+def _was_rate_limited(ticker: str) -> bool:
+    """Whether yf.download's last failure for `ticker` was Yahoo throttling."""
+    # yf.download swallows per-ticker errors into this (private) dict
+    err = str(getattr(getattr(yf, "shared", None), "_ERRORS", {}).get(ticker.upper(), ""))
+    return "RateLimit" in err or "Too Many Requests" in err
+
+
+class _EmptyDownload(Exception):
+    """_download_ohlcv came back empty; raised to keep it out of the disk cache."""
+
+
+@lru_cache(maxsize=64)
 def _ticker(symbol: str) -> yf.Ticker:
-    """Return a yf.Ticker using the best available session."""
+    """
+    Return a shared yf.Ticker (one per symbol) using the best available session.
+    A plain lru_cache rather than st.cache_resource: the fetch worker threads
+    call this without a ScriptRunContext.
+    """
     return yf.Ticker(symbol, session=_SESSION)
 
 
@@ -40,10 +102,42 @@ def _ticker(symbol: str) -> yf.Ticker:
 # Public API
 # ---------------------------------------------------------------------------
 
-@st.cache_data(ttl=600, show_spinner=False)
+@st.cache_data(ttl=_TTL, show_spinner=False)
 def fetch_ohlcv(ticker: str, period: str) -> pd.DataFrame:
-    """Download OHLCV data for a ticker. Returns empty DataFrame on failure."""
-    for attempt in range(3):
+    """
+    Download OHLCV data for a ticker. Returns empty DataFrame on failure.
+
+    Settled history is pulled once per day and persisted to disk; when it
+    comes from that cache (downloaded in an earlier TTL window), only the
+    last few sessions are refreshed and spliced on.
+    """
+    try:
+        history, fetched_bucket = _fetch_ohlcv_daily(ticker, period, date.today().isoformat())
+    except _EmptyDownload:
+        return pd.DataFrame()
+    if fetched_bucket == _ttl_bucket():
+        return history
+    recent = _download_ohlcv(ticker, _RECENT_PERIOD)
+    if recent.empty:
+        return history
+    return pd.concat([history[history.index < recent.index[0]], recent])
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=256)
+def _fetch_ohlcv_daily(ticker: str, period: str, day: str) -> tuple[pd.DataFrame, int]:
+    """(full-period download, TTL window it was downloaded in).
+
+    An empty download raises instead of returning, so a transient failure
+    is not persisted under today's key for the rest of the day.
+    """
+    df = _download_ohlcv(ticker, period)
+    if df.empty:
+        raise _EmptyDownload(ticker)
+    return df, _ttl_bucket()
+
+
+def _download_ohlcv(ticker: str, period: str) -> pd.DataFrame:
+    for attempt in range(_FETCH_ATTEMPTS):
         try:
             df = yf.download(
                 ticker,
@@ -52,33 +146,59 @@ def fetch_ohlcv(ticker: str, period: str) -> pd.DataFrame:
                 progress=False,
                 timeout=15,
                 session=_SESSION,
+                multi_level_index=False,
             )
             if df is None or df.empty:
-                time.sleep(2 ** attempt)
+                # A clean empty response means no data for the symbol
+                # (delisted / invalid); only a throttled one is worth retrying
+                if not _was_rate_limited(ticker):
+                    break
+                _backoff(attempt)
                 continue
+            # Callers index df["Close"] etc. as Series, without squeeze();
+            # flatten in case a yfinance version ignores multi_level_index
             if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.droplevel(1)
-            df.dropna(inplace=True)
+                df.columns = df.columns.get_level_values(0)
+            # One NaN scan serves as both the check and the row mask (daily
+            # bars are usually complete, so the slice is rarely taken).
+            # Every column counts: the model's features read Volume too.
+            incomplete = df.isna().to_numpy().any(axis=1)
+            if incomplete.any():
+                df = df.loc[~incomplete]
             if not df.empty:
-                return df
+                # float32 keeps ~7 significant digits (ample for prices) at
+                # half the cache footprint; kernels upcast via kernel_array
+                prices = df.select_dtypes("float64").columns
+                return df.astype({c: "float32" for c in prices})
         except Exception as e:
             st.error(f"[Attempt {attempt + 1}] OHLCV fetch failed for {ticker}: {e}")
-            time.sleep(2 ** attempt)
+            _backoff(attempt)
     return pd.DataFrame()
 
 
-@st.cache_data(ttl=600, show_spinner=False)
-def fetch_info(ticker: str) -> dict:
-    """Fetch company metadata from yfinance."""
-    for attempt in range(3):
-        try:
-            info = _ticker(ticker).info
-            if info and len(info) > 5:
-                return info
-        except Exception as e:
-            st.warning(f"[Attempt {attempt + 1}] Info fetch failed for {ticker}: {e}")
-        time.sleep(2 ** attempt)
-    return {}
+# Every info field components.ui reads (KPI row + signal panel)
+_INFO_KEYS = (
+    "sector", "marketCap", "volume", "beta",
+    "trailingPE", "forwardPE", "fiftyTwoWeekLow", "fiftyTwoWeekHigh",
+)
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+@lru_cache(maxsize=1024)
+def _format_pub_date(pub_ts: str) -> str:
+    """ISO-8601 timestamp -> "Mon DD, YYYY", read straight off the date prefix."""
+    if not pub_ts:
+        return ""
+    if (len(pub_ts) >= 10 and pub_ts[4] == "-" and pub_ts[7] == "-"
+            and pub_ts[:4].isdigit() and pub_ts[5:7].isdigit() and pub_ts[8:10].isdigit()
+            and 1 <= int(pub_ts[5:7]) <= 12):
+        return f"{_MONTHS[int(pub_ts[5:7]) - 1]} {pub_ts[8:10]}, {pub_ts[:4]}"
+    try:
+        return datetime.fromisoformat(pub_ts.replace("Z", "+00:00")).strftime("%b %d, %Y")
+    except Exception:
+        return pub_ts[:10]
 
 
 @st.cache_data(ttl=300, show_spinner=False)
@@ -87,47 +207,177 @@ def fetch_news(ticker: str, max_items: int = 6) -> list[dict]:
     try:
         raw = _ticker(ticker).news or []
         out = []
+        get = dict.get
         for item in raw[:max_items]:
-            content = item.get("content", {})
-            title = content.get("title") or item.get("title", "")
-            provider = (
-                content.get("provider", {}).get("displayName", "")
-                or item.get("publisher", "")
-            )
-            url = (
-                (content.get("canonicalUrl", {}) or {}).get("url", "")
-                or item.get("link", "")
-            )
-            pub_ts = content.get("pubDate") or ""
-            if pub_ts:
-                try:
-                    pub_date = datetime.fromisoformat(
-                        pub_ts.replace("Z", "+00:00")
-                    ).strftime("%b %d, %Y")
-                except Exception:
-                    pub_date = pub_ts[:10]
-            else:
-                pub_date = ""
-            if title:
-                out.append({
-                    "title": title,
-                    "publisher": provider,
-                    "url": url,
-                    "date": pub_date,
-                })
+            content = get(item, "content") or {}
+            title = get(content, "title") or get(item, "title", "")
+            if not title:
+                continue
+            out.append({
+                "title": title,
+                "publisher": get(get(content, "provider") or {}, "displayName", "")
+                             or get(item, "publisher", ""),
+                "url": get(get(content, "canonicalUrl") or {}, "url", "")
+                       or get(item, "link", ""),
+                "date": _format_pub_date(get(content, "pubDate") or ""),
+            })
         return out
     except Exception:
         return []
 
 
-def fetch_multiple_close(tickers: list[str], period: str) -> dict[str, pd.Series]:
+def _fetch_one_close(ticker: str, period: str) -> pd.Series:
+    """Download the close series for one ticker (thread-safe, no st.* calls)."""
+    df = _ticker(ticker).history(period=period, auto_adjust=True, timeout=10)
+    if df is None or df.empty or "Close" not in df.columns:
+        return pd.Series(dtype=float)
+    close = df["Close"].dropna()
+    if close.index.tz is not None:
+        close.index = close.index.tz_localize(None)
+    return close
+
+
+def _fetch_one_info(ticker: str) -> dict:
+    """Company metadata for one ticker, {} if Yahoo returned a stub (thread-safe, no st.* calls)."""
+    info = _ticker(ticker).info
+    if not info or len(info) <= 5:
+        return {}
+    # Project onto the fields the UI reads (this also copies, leaving the
+    # shared Ticker's dict untouched). Absent keys stay absent so the
+    # UI's .get() defaults still apply. The card's teaser is sliced once
+    # here in place of caching the multi-KB summary.
+    slim = {k: info[k] for k in _INFO_KEYS if k in info}
+    slim["_shortBusinessSummary"] = (info.get("longBusinessSummary") or "")[:180]
+    return slim
+
+
+def _fetch_info_retrying(ticker: str) -> dict:
+    """_fetch_one_info with the fetch retry/backoff policy (no st.* calls).
+
+    Re-raises the last error if every attempt failed; {} means Yahoo kept
+    returning a stub.
+    """
+    error = None
+    for attempt in range(_FETCH_ATTEMPTS):
+        try:
+            info = _fetch_one_info(ticker)
+            if info:
+                return info
+            error = None
+        except Exception as e:
+            error = e
+        _backoff(attempt)
+    if error is not None:
+        raise error
+    return {}
+
+
+@st.cache_data(ttl=_TTL, show_spinner=False)
+def fetch_info(ticker: str) -> dict:
+    """Fetch company metadata from yfinance; {} on failure."""
+    try:
+        return _fetch_info_persisted(ticker, _ttl_bucket())
+    except Exception as e:
+        warnings.warn(f"Info fetch failed for {ticker}: {e}")
+        return {}
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=256)
+def _fetch_info_persisted(ticker: str, bucket: int) -> dict:
+    # Raises when every attempt failed, so failures are not persisted
+    return _fetch_info_retrying(ticker)
+
+
+def fetch_info_many(tickers: tuple[str, ...]) -> dict[str, dict]:
+    """
+    Fetch company metadata for several tickers concurrently.
+    Returns {ticker: info} in the order given; failed tickers map to {}.
+
+    Each ticker goes through fetch_info's own cache, so changing the
+    selection only downloads the tickers not already cached. (st.cache_data
+    lookups are safe from the worker threads; nothing in them calls st.*.)
+    """
+    unique = list(dict.fromkeys(tickers))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(8, len(unique))) as ex:
+        infos = dict(zip(unique, ex.map(fetch_info, unique)))
+    return {t: infos[t] for t in tickers}
+
+
+@st.cache_data(ttl=_TTL, show_spinner=False)
+def fetch_ohlcv_batch(tickers: tuple[str, ...], period: str) -> dict[str, pd.DataFrame]:
+    """
+    Download OHLCV for several tickers with one yf.download call.
+    Returns {ticker: DataFrame}; tickers Yahoo returned nothing for are omitted.
+    """
+    if not tickers:
+        return {}
+    try:
+        raw = yf.download(
+            list(tickers),
+            period=period,
+            auto_adjust=True,
+            progress=False,
+            threads=True,
+            group_by="ticker",
+            timeout=15,
+            session=_SESSION,
+        )
+    except Exception as e:
+        warnings.warn(f"Batch OHLCV fetch failed for {', '.join(tickers)}: {e}")
+        return {}
+    if raw is None or raw.empty:
+        return {}
+
+    out = {}
+    if isinstance(raw.columns, pd.MultiIndex):
+        present = set(raw.columns.get_level_values(0))
+        for t in tickers:
+            if t in present:
+                df = raw[t].dropna(how="all")
+                if not df.empty:
+                    out[t] = df
+    elif len(tickers) == 1:
+        out[tickers[0]] = raw.dropna(how="all")
+    return out
+
+
+@st.cache_data(ttl=_TTL, show_spinner=False)
+def fetch_multiple_close(tickers: list[str], period: str) -> pd.DataFrame:
     """
     Fetch closing prices for multiple tickers.
-    Returns {ticker: pd.Series}.
+    One batched download first; any ticker missing from it is retried
+    individually in parallel. Returns one date-aligned (outer join) frame
+    with a column per ticker in the order given; NaN where a ticker has no
+    bar (e.g. before its listing). Tickers with no data are omitted.
     """
-    result = {}
-    for t in tickers:
-        df = fetch_ohlcv(t, period)
-        if not df.empty and "Close" in df.columns:
-            result[t] = df["Close"].squeeze()
-    return result
+    if not tickers:
+        return pd.DataFrame()
+    fetched = {}
+    # Sorted key: reordering the selection reuses the cached batch
+    for t, df in fetch_ohlcv_batch(tuple(sorted(tickers)), period).items():
+        if "Close" in df.columns:
+            close = df["Close"].dropna()
+            if not close.empty:
+                fetched[t] = close
+
+    missing = [t for t in tickers if t not in fetched]
+    if missing:
+        # Pool sized to the sidebar's 10-ticker limit so every straggler runs
+        # at once. Workers avoid fetch_ohlcv: yf.download keeps module-level
+        # state that concurrent calls clobber.
+        with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(missing))) as ex:
+            futures = {ex.submit(_fetch_one_close, t, period): t for t in missing}
+            for fut in as_completed(futures):
+                t = futures[fut]
+                try:
+                    series = fut.result()
+                except Exception as e:
+                    warnings.warn(f"Close fetch failed for {t}: {e}")
+                    continue
+                if not series.empty:
+                    fetched[t] = series
+    if not fetched:
+        return pd.DataFrame()
+    return pd.concat({t: fetched[t] for t in tickers if t in fetched}, axis=1)
@@ -0,0 +1,129 @@
+"""
+downsample.py — Point reduction for long chart traces.
+
+Functions:
+  lttb_indices       → Largest-Triangle-Three-Buckets point selection
+  ohlc_bucket_reduce → Per-bucket OHLC aggregation for candlesticks
+
+Both keep the first and last bar and return indices/arrays that can be
+used directly for Plotly traces. Series shorter than the target are
+returned untouched.
+"""
+
+import numpy as np
+
+from utils.jit import njit, kernel_array
+
+
+# Traces longer than this are reduced to ~TARGET_POINTS before plotting.
+DOWNSAMPLE_THRESHOLD = 2000
+TARGET_POINTS        = 1500
+
+
+# ─────────────────────────────────────────────
+# LTTB
+# ─────────────────────────────────────────────
+@njit("int64[:](float64[:], float64[:], int64)", cache=True)
+def _lttb_kernel(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    n   = x.shape[0]
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the *next* bucket is the third triangle vertex
+        nxt_lo = int((i + 1) * every) + 1
+        nxt_hi = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        cnt   = 0
+        for j in range(nxt_lo, nxt_hi):
+            if not np.isnan(y[j]):
+                avg_x += x[j]
+                avg_y += y[j]
+                cnt   += 1
+        if cnt > 0:
+            avg_x /= cnt
+            avg_y /= cnt
+
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        best      = lo
+        best_area = -1.0
+        for j in range(lo, hi):
+            area = abs(
+                (x[a] - avg_x) * (y[j] - y[a])
+                - (x[a] - x[j]) * (avg_y - y[a])
+            )
+            if area > best_area:
+                best_area = area
+                best      = j
+        out[i + 1] = best
+        a = best
+    return out
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int = TARGET_POINTS) -> np.ndarray:
+    """
+    Indices of the points LTTB keeps from (x, y).
+    `x` may be datetime64 — it is compared as int64 nanoseconds.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x_f = np.asarray(x).astype("int64").astype(np.float64)
+    return _lttb_kernel(x_f, kernel_array(y), n_out)
+
+
+# ─────────────────────────────────────────────
+# OHLC BUCKETS
+# ─────────────────────────────────────────────
+@njit(
+    "Tuple((int64[:], float64[:], float64[:], float64[:], float64[:]))"
+    "(float64[:], float64[:], float64[:], float64[:], int64)",
+    cache=True,
+)
+def _ohlc_kernel(open_, high, low, close, n_out):
+    n     = close.shape[0]
+    first = np.empty(n_out, dtype=np.int64)
+    o = np.empty(n_out)
+    h = np.empty(n_out)
+    l = np.empty(n_out)
+    c = np.empty(n_out)
+    every = n / n_out
+    for i in range(n_out):
+        lo = int(i * every)
+        hi = min(int((i + 1) * every), n)
+        if hi <= lo:
+            hi = lo + 1
+        first[i] = lo
+        o[i] = open_[lo]
+        c[i] = close[hi - 1]
+        h[i] = high[lo]
+        l[i] = low[lo]
+        for j in range(lo + 1, hi):
+            if high[j] > h[i]:
+                h[i] = high[j]
+            if low[j] < l[i]:
+                l[i] = low[j]
+    return first, o, h, l, c
+
+
+def ohlc_bucket_reduce(open_, high, low, close, n_out: int = TARGET_POINTS):
+    """
+    Aggregate consecutive bars into `n_out` candles
+    (first open, max high, min low, last close).
+    Returns (bucket_start_indices, open, high, low, close).
+    """
+    n = len(close)
+    if n <= n_out:
+        return (np.arange(n), np.asarray(open_, dtype=np.float64),
+                np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64),
+                np.asarray(close, dtype=np.float64))
+    return _ohlc_kernel(
+        kernel_array(open_), kernel_array(high),
+        kernel_array(low), kernel_array(close),
+        n_out,
+    )
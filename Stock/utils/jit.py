@@ -0,0 +1,34 @@
+"""
+jit.py — Optional Numba acceleration.
+
+Exposes `njit`, which compiles with Numba when it is installed and falls
+back to a no-op decorator otherwise, so kernels stay importable (and
+correct, just slower) on hosts without Numba.
+
+Kernels declare explicit ``float64[:]`` signatures, which Numba will not
+re-specialize for read-only buffers (what pandas hands out under
+copy-on-write); pass their inputs through `kernel_array` first.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+def kernel_array(values) -> np.ndarray:
+    """float64 array a typed kernel accepts: copied only if read-only."""
+    arr = np.asarray(values, dtype=np.float64)
+    return arr if arr.flags.writeable else arr.copy()
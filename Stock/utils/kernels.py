@@ -0,0 +1,318 @@
+"""
+kernels.py — Numba kernels behind the indicator functions in analysis.py.
+
+Each kernel takes a float64 NumPy array and returns float64 arrays with the
+same length and NaN warm-up as the pandas implementation it replaces:
+  rolling_mean  → close.rolling(n).mean()
+  ema           → close.ewm(span=n, adjust=False).mean()
+  rsi           → Wilder RSI (EWM alpha=1/period, adjust=False)
+  macd          → (macd, signal, histogram)
+  bollinger     → (upper, middle, lower)
+  all_indicators→ fused single pass for compute_signals
+  model_features→ fused price/volume block of model._build_features
+  rollout_step  → in-place forecast-row update for the model rollout
+
+Inputs are assumed NaN-free (fetch_ohlcv drops incomplete bars).
+
+Every kernel carries an explicit signature, so Numba compiles it eagerly
+when this module is imported (or loads it from the cache=True on-disk
+cache) rather than on the first call from a rerun.
+"""
+
+import numpy as np
+
+from utils.jit import njit
+
+
+@njit("float64[:](float64[:], int64)", cache=True)
+def rolling_mean(x, n):
+    """Running window sum on x - x[0] (as in all_indicators): O(1) per bar."""
+    out = np.full(x.shape[0], np.nan)
+    if n < 1 or x.shape[0] < n:
+        return out
+    base = x[0]
+    s = 0.0
+    for i in range(x.shape[0]):
+        s += x[i] - base
+        if i >= n:
+            s -= x[i - n] - base
+        if i >= n - 1:
+            out[i] = s / n + base
+    return out
+
+
+@njit("float64[:](float64[:], int64)", cache=True)
+def ema(x, span):
+    out = np.empty(x.shape[0])
+    if x.shape[0] == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    out[0] = x[0]
+    for i in range(1, x.shape[0]):
+        out[i] = alpha * x[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+@njit("float64[:](float64[:], int64)", cache=True)
+def rsi(close, period):
+    """
+    Wilder-smoothed RSI, identical to
+    gain/loss.ewm(alpha=1/period, adjust=False, min_periods=period):
+    seeded with the first delta, NaN until `period` deltas are in.
+    """
+    n   = close.shape[0]
+    out = np.full(n, np.nan)
+    if n < 2:
+        return out
+    alpha = 1.0 / period
+    d = close[1] - close[0]
+    avg_gain = d if d > 0 else 0.0
+    avg_loss = -d if d < 0 else 0.0
+    for i in range(1, n):
+        if i > 1:
+            d = close[i] - close[i - 1]
+            avg_gain = (1.0 - alpha) * avg_gain + alpha * (d if d > 0 else 0.0)
+            avg_loss = (1.0 - alpha) * avg_loss + alpha * (-d if d < 0 else 0.0)
+        if i >= period and avg_loss != 0.0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+@njit("UniTuple(float64[:], 3)(float64[:], int64, int64, int64)", cache=True)
+def macd(close, fast, slow, signal_period):
+    line   = ema(close, fast) - ema(close, slow)
+    signal = ema(line, signal_period)
+    return line, signal, line - signal
+
+
+@njit("UniTuple(float64[:], 3)(float64[:], int64, float64)", cache=True)
+def bollinger(close, period, num_std):
+    """
+    Single pass: a sliding-window Welford update carries the mean and the
+    sum of squared deviations (M2), so each step costs O(1) regardless of
+    `period` and all three bands are written together.
+    """
+    n      = close.shape[0]
+    upper  = np.full(n, np.nan)
+    middle = np.full(n, np.nan)
+    lower  = np.full(n, np.nan)
+    if period < 2 or n < period:
+        return upper, middle, lower
+
+    mean = 0.0
+    m2   = 0.0
+    for i in range(period):
+        d     = close[i] - mean
+        mean += d / (i + 1)
+        m2   += d * (close[i] - mean)
+
+    for i in range(period - 1, n):
+        if i >= period:
+            x, old = close[i], close[i - period]
+            prev   = mean
+            mean  += (x - old) / period
+            m2    += (x - old) * (x - mean + old - prev)
+        sd = np.sqrt(m2 / (period - 1)) if m2 > 0.0 else 0.0
+        middle[i] = mean
+        upper[i]  = mean + num_std * sd
+        lower[i]  = mean - num_std * sd
+    return upper, middle, lower
+
+
+@njit("UniTuple(float64[:], 9)(float64[:])", cache=True)
+def all_indicators(close):
+    """
+    Every indicator compute_signals needs, in one pass over `close`:
+    (ma20, ma50, ma200, rsi14, macd, signal, histogram, bb_upper, bb_lower).
+
+    Windows are tracked with running sums on close - close[0] to limit
+    cancellation in the BB variance; RSI uses the same Wilder recurrence
+    as `rsi`.
+    """
+    n = close.shape[0]
+    ma20  = np.full(n, np.nan)
+    ma50  = np.full(n, np.nan)
+    ma200 = np.full(n, np.nan)
+    rsi14 = np.full(n, np.nan)
+    line  = np.empty(n)
+    sig   = np.empty(n)
+    hist  = np.empty(n)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    if n == 0:
+        return ma20, ma50, ma200, rsi14, line, sig, hist, upper, lower
+
+    base = close[0]
+    a12, a26, a9 = 2.0 / 13.0, 2.0 / 27.0, 2.0 / 10.0
+    e12 = e26 = close[0]
+    s20 = q20 = s50 = s200 = 0.0
+    avg_gain = avg_loss = 0.0
+
+    for i in range(n):
+        x = close[i] - base
+
+        # ── SMA / BB windows ──
+        s20  += x
+        q20  += x * x
+        s50  += x
+        s200 += x
+        if i >= 20:
+            old = close[i - 20] - base
+            s20 -= old
+            q20 -= old * old
+        if i >= 50:
+            s50 -= close[i - 50] - base
+        if i >= 200:
+            s200 -= close[i - 200] - base
+        if i >= 19:
+            m = s20 / 20.0
+            ma20[i] = m + base
+            var = (q20 - 20.0 * m * m) / 19.0
+            sd = np.sqrt(var) if var > 0.0 else 0.0
+            upper[i] = ma20[i] + 2.0 * sd
+            lower[i] = ma20[i] - 2.0 * sd
+        if i >= 49:
+            ma50[i] = s50 / 50.0 + base
+        if i >= 199:
+            ma200[i] = s200 / 200.0 + base
+
+        # ── RSI (Wilder, 14) ──
+        if i >= 1:
+            d = close[i] - close[i - 1]
+            g = d if d > 0 else 0.0
+            l = -d if d < 0 else 0.0
+            if i == 1:
+                avg_gain, avg_loss = g, l
+            else:
+                avg_gain = (13.0 * avg_gain + g) / 14.0
+                avg_loss = (13.0 * avg_loss + l) / 14.0
+            if i >= 14 and avg_loss != 0.0:
+                rsi14[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        # ── MACD (12/26/9, adjust=False) ──
+        if i > 0:
+            e12 = a12 * close[i] + (1.0 - a12) * e12
+            e26 = a26 * close[i] + (1.0 - a26) * e26
+        line[i] = e12 - e26
+        if i == 0:
+            sig[i] = line[i]
+        else:
+            sig[i] = a9 * line[i] + (1.0 - a9) * sig[i - 1]
+        hist[i] = line[i] - sig[i]
+
+    return ma20, ma50, ma200, rsi14, line, sig, hist, upper, lower
+
+
+@njit("float64[:, :](float64[:], float64[:])", cache=True)
+def model_features(close, volume):
+    """
+    Price/volume block of model._build_features in one pass, one row per
+    bar, each value already shifted by a bar (row i sees bars < i only):
+      lag_1, lag_2, lag_3, lag_5, lag_10,
+      roll_mean_5, roll_mean_10, roll_mean_20, roll_std_5, roll_std_20,
+      momentum_5, momentum_10, momentum_20,
+      volume_ma5, volume_ratio, bb_position
+    Stds are ddof=1; windows use running sums on close - close[0], as in
+    all_indicators. NaN wherever the pandas rolling/shift leaves one.
+    """
+    n   = close.shape[0]
+    out = np.full((n, 16), np.nan)
+    if n == 0:
+        return out
+
+    base = close[0]
+    s5 = s10 = s20 = q5 = q20 = 0.0
+    v5 = v20 = 0.0
+
+    for i in range(n - 1):
+        x = close[i] - base
+        s5  += x
+        s10 += x
+        s20 += x
+        q5  += x * x
+        q20 += x * x
+        v5  += volume[i]
+        v20 += volume[i]
+        if i >= 5:
+            old = close[i - 5] - base
+            s5 -= old
+            q5 -= old * old
+            v5 -= volume[i - 5]
+        if i >= 10:
+            s10 -= close[i - 10] - base
+        if i >= 20:
+            old = close[i - 20] - base
+            s20 -= old
+            q20 -= old * old
+            v20 -= volume[i - 20]
+
+        # Statistics of the window ending at bar i land on row i + 1
+        r = out[i + 1]
+        r[0] = close[i]
+        if i >= 1:
+            r[1] = close[i - 1]
+        if i >= 2:
+            r[2] = close[i - 2]
+        if i >= 4:
+            r[3] = close[i - 4]
+            m5    = s5 / 5.0
+            var5  = (q5 - 5.0 * m5 * m5) / 4.0
+            r[5]  = m5 + base
+            r[8]  = np.sqrt(var5) if var5 > 0.0 else 0.0
+            r[13] = v5 / 5.0
+        if i >= 5:
+            r[10] = close[i] / close[i - 5] - 1.0
+        if i >= 9:
+            r[4] = close[i - 9]
+            r[6] = s10 / 10.0 + base
+        if i >= 10:
+            r[11] = close[i] / close[i - 10] - 1.0
+        if i >= 19:
+            m20   = s20 / 20.0
+            var20 = (q20 - 20.0 * m20 * m20) / 19.0
+            sd20  = np.sqrt(var20) if var20 > 0.0 else 0.0
+            r[7]  = m20 + base
+            r[9]  = sd20
+            r[14] = volume[i] / (v20 / 20.0 + 1e-9)
+            r[15] = (close[i] - r[7]) / (2.0 * sd20 + 1e-9)
+        if i >= 20:
+            r[12] = close[i] / close[i - 20] - 1.0
+    return out
+
+
+@njit("void(float64[:], float64[:], float64[:], int64[:], float64, float64)", cache=True)
+def rollout_step(row, win, sums, idx, new_close, base):
+    """
+    Advance model.train_and_predict's forecast row by one predicted close,
+    in place:
+      win   last 21 closes, oldest first (shifted left, new_close appended)
+      sums  window sums on close - base: (s5, s10, s20, q5, q20)
+      idx   row columns, -1 if absent: lag_1, lag_2, lag_3, lag_5, lag_10,
+            roll_mean_5, roll_mean_10, roll_mean_20, roll_std_5, roll_std_20,
+            momentum_5, momentum_10, momentum_20
+    Rolling stds are population (ddof=0), matching the rollout's np.std.
+    """
+    x  = new_close - base
+    o5, o10, o20 = win[16] - base, win[11] - base, win[1] - base
+    sums[0] += x - o5
+    sums[1] += x - o10
+    sums[2] += x - o20
+    sums[3] += x * x - o5 * o5
+    sums[4] += x * x - o20 * o20
+    for j in range(20):
+        win[j] = win[j + 1]
+    win[20] = new_close
+
+    m5, m10, m20 = sums[0] / 5.0, sums[1] / 10.0, sums[2] / 20.0
+    v5  = sums[3] / 5.0 - m5 * m5
+    v20 = sums[4] / 20.0 - m20 * m20
+    vals = (
+        win[19], win[18], win[17], win[15], win[10],
+        m5 + base, m10 + base, m20 + base,
+        np.sqrt(v5) if v5 > 0.0 else 0.0,
+        np.sqrt(v20) if v20 > 0.0 else 0.0,
+        win[20] / win[15] - 1.0, win[20] / win[10] - 1.0, win[20] / win[0] - 1.0,
+    )
+    for k in range(13):
+        if idx[k] >= 0:
+            row[idx[k]] = vals[k]
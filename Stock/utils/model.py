@@ -10,11 +10,15 @@ Features used per sample:
 
 Models available:
   - Random Forest Regressor
+  - Gradient Boosting (histogram-based)
   - Linear Regression (with engineered features)
 
 Outputs:
   - ModelResult dataclass with future_dates, future_prices,
     hist_pred, rmse, mae, r2, feature_importances
+
+train_and_predict_cached memoizes results per (ticker, period, last bar)
+so Streamlit reruns do not refit the model.
 """
 
 from __future__ import annotations
@@ -22,15 +26,21 @@ from dataclasses import dataclass, field
 
 import numpy as np
 import pandas as pd
+import streamlit as st
 from datetime import timedelta
 
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.linear_model import Ridge
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from sklearn.model_selection import TimeSeriesSplit
+from sklearn import config_context
+from sklearn.base import clone
+from sklearn.model_selection import TimeSeriesSplit, cross_val_score
 
+from utils import kernels
 from utils.analysis import compute_rsi, compute_macd
+from utils.jit import NUMBA_AVAILABLE, kernel_array
+from utils.data import fetch_ohlcv
 
 
 # ─────────────────────────────────────────────
@@ -53,14 +63,63 @@ class ModelResult:
 # ─────────────────────────────────────────────
 # FEATURE ENGINEERING
 # ─────────────────────────────────────────────
+# Price/volume columns kernels.model_features emits, in its column order
+_KERNEL_FEATURES = [
+    "lag_1", "lag_2", "lag_3", "lag_5", "lag_10",
+    "roll_mean_5", "roll_mean_10", "roll_mean_20", "roll_std_5", "roll_std_20",
+    "momentum_5", "momentum_10", "momentum_20",
+    "volume_ma5", "volume_ratio", "bb_position",
+]
+
+_FEATURE_NAMES = _KERNEL_FEATURES[:15] + [
+    "rsi", "macd_hist", "macd_line", "bb_position", "day_of_week", "month",
+]
+
+
+# Row columns kernels.rollout_step updates, in its index order
+_ROLLOUT_FEATURES = [
+    "lag_1", "lag_2", "lag_3", "lag_5", "lag_10",
+    "roll_mean_5", "roll_mean_10", "roll_mean_20", "roll_std_5", "roll_std_20",
+    "momentum_5", "momentum_10", "momentum_20",
+]
+
+
+# Calendar features → the DatetimeIndex attribute they are read from
+_CALENDAR_FEATURES = {"day_of_week": "dayofweek", "month": "month"}
+
+
+def _dates(index: pd.Index) -> pd.DatetimeIndex:
+    """`index` as a DatetimeIndex, converted only if it isn't one already."""
+    return index if isinstance(index, pd.DatetimeIndex) else pd.to_datetime(index)
+
+
+def _shift1(a: np.ndarray) -> np.ndarray:
+    """NumPy equivalent of Series.shift(1) for a float array."""
+    return np.concatenate(([np.nan], a[:-1]))
+
+
+def _frame_key(df: pd.DataFrame) -> tuple:
+    """Cache fingerprint: shape, columns and a hash of every value and label."""
+    return (df.shape, tuple(df.columns), int(pd.util.hash_pandas_object(df).sum()))
+
+
+@st.cache_resource(show_spinner=False, max_entries=16, hash_funcs={pd.DataFrame: _frame_key})
 def _build_features(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
     """
     Build a feature matrix from OHLCV data.
     Returns (feature_df, feature_names).
     Rows with NaN (warm-up period) are dropped.
+    Memoized on a hash of `df`'s full contents; the result is shared, do
+    not mutate it.
     """
-    close  = df["Close"].squeeze()
-    volume = df["Volume"].squeeze() if "Volume" in df.columns else pd.Series(0, index=df.index)
+    close  = df["Close"]
+    volume = df["Volume"] if "Volume" in df.columns else pd.Series(0, index=df.index)
+
+    if NUMBA_AVAILABLE:
+        c = kernel_array(close.to_numpy())
+        v = kernel_array(volume.to_numpy())
+        if not (np.isnan(c).any() or np.isnan(v).any()):
+            return _build_features_kernel(df, close, c, v)
 
     feat = pd.DataFrame(index=df.index)
 
@@ -68,12 +127,14 @@ def _build_features(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
     for lag in [1, 2, 3, 5, 10]:
         feat[f"lag_{lag}"] = close.shift(lag)
 
-    # ── Rolling statistics ──
+    # ── Rolling statistics (20-day pair reused for the BB position) ──
+    rm20 = close.rolling(20).mean()
+    rs20 = close.rolling(20).std()
     feat["roll_mean_5"]  = close.rolling(5).mean().shift(1)
     feat["roll_mean_10"] = close.rolling(10).mean().shift(1)
-    feat["roll_mean_20"] = close.rolling(20).mean().shift(1)
+    feat["roll_mean_20"] = rm20.shift(1)
     feat["roll_std_5"]   = close.rolling(5).std().shift(1)
-    feat["roll_std_20"]  = close.rolling(20).std().shift(1)
+    feat["roll_std_20"]  = rs20.shift(1)
 
     # ── Price momentum ──
     feat["momentum_5"]   = (close / close.shift(5) - 1).shift(1)
@@ -94,22 +155,71 @@ def _build_features(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
     feat["macd_line"] = macd["macd"].shift(1)
 
     # ── Bollinger Band position ──
-    bb_mid = close.rolling(20).mean()
-    bb_std = close.rolling(20).std()
-    feat["bb_position"] = ((close - bb_mid) / (2 * bb_std + 1e-9)).shift(1)
+    feat["bb_position"] = ((close - rm20) / (2 * rs20 + 1e-9)).shift(1)
 
     # ── Calendar features ──
-    feat["day_of_week"] = pd.to_datetime(df.index).dayofweek
-    feat["month"]       = pd.to_datetime(df.index).month
+    dates = _dates(df.index)
+    feat["day_of_week"] = dates.dayofweek.to_numpy()
+    feat["month"]       = dates.month.to_numpy()
 
     feature_names = feat.columns.tolist()
     feat.dropna(inplace=True)
     return feat, feature_names
 
 
+def _build_features_kernel(
+    df:     pd.DataFrame,
+    close:  pd.Series,
+    c:      np.ndarray,
+    v:      np.ndarray,
+) -> tuple[pd.DataFrame, list[str]]:
+    """
+    _build_features on the Numba path: the lag/rolling/momentum/volume/BB
+    block comes from one kernels.model_features pass, and the matrix is
+    assembled in NumPy with a single NaN-row mask in place of dropna.
+    """
+    block = kernels.model_features(c, v)
+    macd  = compute_macd(close)
+    dates = _dates(df.index)
+
+    mat = np.column_stack([
+        block[:, :15],
+        _shift1(compute_rsi(close, period=14).to_numpy()),
+        _shift1(macd["histogram"].to_numpy()),
+        _shift1(macd["macd"].to_numpy()),
+        block[:, 15],
+        dates.dayofweek.to_numpy(),
+        dates.month.to_numpy(),
+    ])
+    keep = ~np.isnan(mat).any(axis=1)
+    feat = pd.DataFrame(mat[keep], index=df.index[keep], columns=_FEATURE_NAMES)
+    return feat, list(_FEATURE_NAMES)
+
+
 # ─────────────────────────────────────────────
 # TRAIN & PREDICT
 # ─────────────────────────────────────────────
+def _row_predictor(model):
+    """
+    Single-row predict for the rollout, taking a C-contiguous float32 (1, F)
+    array. A fitted random forest is averaged over its estimators' low-level
+    `tree_` structures, skipping the per-call validation of the forest and
+    of each estimator, and the joblib dispatch. Other estimators go through
+    their own predict.
+    """
+    if not isinstance(model, RandomForestRegressor):
+        return lambda row2d: model.predict(row2d)[0]
+
+    trees = [est.tree_ for est in model.estimators_]
+
+    def predict(row2d: np.ndarray) -> float:
+        total = 0.0
+        for tree in trees:
+            total += tree.predict(row2d)[0, 0]
+        return total / len(trees)
+    return predict
+
+
 def train_and_predict(
     df:         pd.DataFrame,
     model_name: str = "Random Forest",
@@ -119,52 +229,75 @@ def train_and_predict(
     Train on historical data, predict `pred_days` into the future.
     Uses TimeSeriesSplit cross-validation for honest RMSE.
     """
-    close = df["Close"].squeeze()
+    close = df["Close"]
 
     feat_df, feature_names = _build_features(df)
 
-    # Align target with features (feat_df has NaN rows dropped)
-    y_full = close.loc[feat_df.index].values
-    X_full = feat_df.values
-
-    # ── Scale ──
-    scaler_X = MinMaxScaler()
-    scaler_y = MinMaxScaler()
-    X_scaled = scaler_X.fit_transform(X_full)
-    y_scaled = scaler_y.fit_transform(y_full.reshape(-1, 1)).ravel()
+    # Align target with features (feat_df has NaN rows dropped); float64
+    # even though the cached OHLCV stores prices as float32
+    y_full = close.loc[feat_df.index].to_numpy(dtype=np.float64)
+    X_full = feat_df.to_numpy(dtype=np.float64)
 
     # ── Pick model ──
     if model_name == "Linear Regression":
-        model = Ridge(alpha=1.0)
+        model = Ridge(alpha=1.0, solver="cholesky")
     elif model_name == "Gradient Boosting":
-        model = GradientBoostingRegressor(
-            n_estimators=300, learning_rate=0.05,
-            max_depth=4, random_state=42,
+        # Histogram-binned boosting: splits are searched over 256 uint8
+        # bins per feature instead of every distinct threshold. No early
+        # stopping: HGB holds out a random (not chronological) split for
+        # it, which would let later bars decide when earlier ones stop.
+        model = HistGradientBoostingRegressor(
+            max_iter=300, learning_rate=0.05, max_depth=6,
+            early_stopping=False, random_state=42,
         )
     else:  # default: Random Forest
+        # Accuracy plateaus well before 300 trees; 150 halves fit time and
+        # model size at the same holdout error
         model = RandomForestRegressor(
-            n_estimators=300, max_depth=10,
+            n_estimators=150, max_depth=10,
             min_samples_leaf=3, random_state=42, n_jobs=-1,
         )
 
+    # ── Scale ──
+    # Only Ridge needs scaling: its alpha penalizes coefficients in MinMax
+    # units. Trees are invariant to per-feature monotone transforms and
+    # their predictions are affine-equivariant in y, so they train on raw
+    # values. Either way the model sees a C-contiguous float32 matrix,
+    # which is what sklearn's tree code uses internally, so fit/predict
+    # skip their own F→C float32 copy. The affine coefficients are kept to
+    # map predictions back and to scale the rollout rows inline.
+    if isinstance(model, Ridge):
+        scaler_X = MinMaxScaler().fit(X_full)
+        scaler_y = MinMaxScaler().fit(y_full.reshape(-1, 1))
+        sx_scale, sx_min = scaler_X.scale_, scaler_X.min_
+        sy_scale, sy_min = scaler_y.scale_[0], scaler_y.min_[0]
+        X_scaled = np.ascontiguousarray(X_full * sx_scale + sx_min, dtype=np.float32)
+        y_scaled = y_full * sy_scale + sy_min
+    else:
+        sx_scale, sx_min = 1.0, 0.0
+        sy_scale, sy_min = 1.0, 0.0
+        X_scaled = np.ascontiguousarray(X_full, dtype=np.float32)
+        y_scaled = y_full
+
     # ── TimeSeriesSplit CV ──
-    tscv = TimeSeriesSplit(n_splits=5)
-    cv_errors = []
-    for train_idx, val_idx in tscv.split(X_scaled):
-        model.fit(X_scaled[train_idx], y_scaled[train_idx])
-        val_pred = scaler_y.inverse_transform(
-            model.predict(X_scaled[val_idx]).reshape(-1, 1)
-        ).ravel()
-        val_true = y_full[val_idx]
-        cv_errors.append(np.sqrt(mean_squared_error(val_true, val_pred)))
-    cv_rmse = float(np.mean(cv_errors))
+    # Only the forest's folds are worth worker processes; each then fits
+    # single-threaded so the two levels don't oversubscribe the cores.
+    # Ridge folds take milliseconds, and HGB already uses OpenMP threads.
+    cv_model, cv_jobs = model, 1
+    if isinstance(model, RandomForestRegressor):
+        cv_model, cv_jobs = clone(model).set_params(n_jobs=1), -1
+    neg_rmse = cross_val_score(
+        cv_model, X_scaled, y_scaled, cv=TimeSeriesSplit(n_splits=5),
+        scoring="neg_root_mean_squared_error", n_jobs=cv_jobs,
+    )
+    # Fold RMSE on the scaled target → price units (the scaling is affine)
+    cv_rmse = float(np.mean(-neg_rmse) / sy_scale)
 
     # ── Final fit on all data ──
     model.fit(X_scaled, y_scaled)
 
     # ── In-sample predictions ──
-    hist_scaled = model.predict(X_scaled).reshape(-1, 1)
-    hist_pred_aligned = scaler_y.inverse_transform(hist_scaled).ravel()
+    hist_pred_aligned = (model.predict(X_scaled) - sy_min) / sy_scale
 
     # Pad back to original length with NaN for the warm-up rows
     n_warmup = len(close) - len(hist_pred_aligned)
@@ -172,65 +305,78 @@ def train_and_predict(
 
     # ── Metrics on last 20% ──
     split = int(len(y_full) * 0.8)
-    test_pred = scaler_y.inverse_transform(
-        model.predict(X_scaled[split:]).reshape(-1, 1)
-    ).ravel()
+    test_pred = (model.predict(X_scaled[split:]) - sy_min) / sy_scale
     test_true = y_full[split:]
-    rmse = float(np.sqrt(mean_squared_error(test_true, test_pred)))
-    mae  = float(mean_absolute_error(test_true, test_pred))
-    r2   = float(r2_score(test_true, test_pred))
+    resid  = test_true - test_pred
+    ss_res = float(resid @ resid)
+    dev    = test_true - test_true.mean()
+    ss_tot = float(dev @ dev)
+    rmse = float(np.sqrt(ss_res / len(resid)))
+    mae  = float(np.abs(resid).mean())
+    # Constant holdout: r2_score's force_finite convention
+    r2   = 1.0 - ss_res / ss_tot if ss_tot > 0 else (1.0 if ss_res == 0 else 0.0)
 
     # ── Future prediction (iterative rollout) ──
-    last_row        = X_full[-1].copy()
-    last_close      = float(close.iloc[-1])
-    future_prices   = []
-    close_history   = list(close.values)
-
-    # Column index mapping for feature update
-    col = {name: i for i, name in enumerate(feature_names)}
+    # One feature row, updated in place each step
+    row             = X_full[-1].copy()
+    future_prices   = np.empty(pred_days, dtype=np.float64)
 
-    for step in range(pred_days):
-        row_scaled = scaler_X.transform(last_row.reshape(1, -1))
-        pred_scaled = model.predict(row_scaled)[0]
-        pred_price  = float(
-            scaler_y.inverse_transform([[pred_scaled]])[0][0]
-        )
-        future_prices.append(pred_price)
+    # ── Future dates (business days) ──
+    last_date    = df.index[-1]
+    future_dates = pd.bdate_range(
+        start=last_date + timedelta(days=1), periods=pred_days
+    )
 
-        # ── Update lag features for next step ──
-        new_close = pred_price
-        close_history.append(new_close)
-        ch = np.array(close_history)
+    # Last 21 closes cover every lag/momentum lookback. Window sums are kept
+    # incrementally (kernels.rollout_step), offset by `base` to limit
+    # cancellation in the variances.
+    win  = kernel_array(close.to_numpy()[-21:]).copy()
+    base = float(win[-1])
+    tail = win - base
+    sums = np.array([
+        tail[-5:].sum(), tail[-10:].sum(), tail[-20:].sum(),
+        (tail[-5:] ** 2).sum(), (tail[-20:] ** 2).sum(),
+    ])
+
+    # Row columns rollout_step writes, resolved once (-1 if absent)
+    col = {name: i for i, name in enumerate(feature_names)}
+    idx = np.array([col.get(name, -1) for name in _ROLLOUT_FEATURES], dtype=np.int64)
 
-        new_row = last_row.copy()
-        if "lag_1"  in col: new_row[col["lag_1"]]  = close_history[-2]
-        if "lag_2"  in col: new_row[col["lag_2"]]  = close_history[-3]
-        if "lag_3"  in col: new_row[col["lag_3"]]  = close_history[-4]
-        if "lag_5"  in col: new_row[col["lag_5"]]  = close_history[-6]  if len(close_history) > 5 else new_close
-        if "lag_10" in col: new_row[col["lag_10"]] = close_history[-11] if len(close_history) > 10 else new_close
+    # One preallocated (1, F) float32 block is rewritten and predicted on
+    row2d = np.empty((1, row.shape[0]), dtype=np.float32)
 
-        if "roll_mean_5"  in col: new_row[col["roll_mean_5"]]  = float(np.mean(ch[-5:]))
-        if "roll_mean_10" in col: new_row[col["roll_mean_10"]] = float(np.mean(ch[-10:]))
-        if "roll_mean_20" in col: new_row[col["roll_mean_20"]] = float(np.mean(ch[-20:]))
-        if "roll_std_5"   in col: new_row[col["roll_std_5"]]   = float(np.std(ch[-5:]))
-        if "roll_std_20"  in col: new_row[col["roll_std_20"]]  = float(np.std(ch[-20:]))
+    predict = _row_predictor(model)
 
-        if "momentum_5"  in col: new_row[col["momentum_5"]]  = (ch[-1] / ch[-6]  - 1) if len(ch) > 5  else 0
-        if "momentum_10" in col: new_row[col["momentum_10"]] = (ch[-1] / ch[-11] - 1) if len(ch) > 10 else 0
-        if "momentum_20" in col: new_row[col["momentum_20"]] = (ch[-1] / ch[-21] - 1) if len(ch) > 20 else 0
+    # Calendar block for the horizon, one (pred_days,) column per calendar
+    # feature; row `step` is written before that step's predict, so each
+    # prediction sees its own date's weekday and month
+    cal_names = [name for name in _CALENDAR_FEATURES if name in col]
+    cal_cols  = [col[name] for name in cal_names]
+    calendar  = np.column_stack(
+        [getattr(future_dates, _CALENDAR_FEATURES[name]) for name in cal_names]
+        or [np.empty((pred_days, 0))]
+    ).astype(np.float64)
 
-        last_row = new_row
+    with config_context(assume_finite=True):
+        for step in range(pred_days):
+            row[cal_cols] = calendar[step]
+            row2d[0]    = row * sx_scale + sx_min
+            pred_scaled = predict(row2d)
+            pred_price  = float((pred_scaled - sy_min) / sy_scale)
+            future_prices[step] = pred_price
 
-    future_prices = np.array(future_prices)
-
-    # ── Future dates (business days) ──
-    last_date    = df.index[-1]
-    future_dates = pd.bdate_range(
-        start=last_date + timedelta(days=1), periods=pred_days
-    )
+            kernels.rollout_step(row, win, sums, idx, pred_price, base)
 
     # ── Feature importances (RF / GB only) ──
     fi = getattr(model, "feature_importances_", None)
+    if fi is None and isinstance(model, HistGradientBoostingRegressor):
+        # No impurity importances on HGB: permutation importance on the
+        # holdout slice, clipped and normalized like the tree importances
+        perm = permutation_importance(
+            model, X_scaled[split:], y_scaled[split:],
+            n_repeats=5, random_state=42,
+        ).importances_mean.clip(min=0.0)
+        fi = perm / perm.sum() if perm.sum() > 0 else perm
 
     return ModelResult(
         future_dates=future_dates,
@@ -244,3 +390,24 @@ def train_and_predict(
         model_name=model_name,
         cv_rmse=cv_rmse,
     )
+
+
+# ─────────────────────────────────────────────
+# CACHED ENTRY POINT
+# ─────────────────────────────────────────────
+@st.cache_resource(show_spinner=False, max_entries=16)
+def train_and_predict_cached(
+    ticker:     str,
+    period:     str,
+    last_ts:    int,
+    model_name: str = "Random Forest",
+    pred_days:  int = 30,
+) -> ModelResult:
+    """
+    train_and_predict on the cached OHLCV for (ticker, period).
+    `last_ts` (last bar timestamp, ns) is part of the cache key only, so a
+    new bar triggers a refit while plain reruns reuse the shared result.
+    """
+    return train_and_predict(
+        fetch_ohlcv(ticker, period), model_name=model_name, pred_days=pred_days,
+    )